@@ -0,0 +1,170 @@
+import pygame as pg
+
+from assets import ASSETS, AssetCache
+
+
+def slice_sheet(sheet: pg.Surface, grid: tuple[int, int]) -> list[pg.Surface]:
+    """
+    スプライトシートを同じ大きさのコマに切り分ける
+    引数1 sheet：スプライトシートのSurface
+    引数2 grid：横，縦のコマ数
+    戻り値：左上から右へ，上から下へ並べたコマのSurfaceのリスト
+    """
+    cols, rows = grid
+    w, h = sheet.get_width()//cols, sheet.get_height()//rows
+    return [sheet.subsurface((c*w, r*h, w, h)) for r in range(rows) for c in range(cols)]
+
+
+class Animation:
+    """
+    変換済みのコマの列と1コマの表示時間を持ち，経過時間からコマを選ぶクラス
+    同じ名前のアニメーションはすべてのスプライトで共有する
+    """
+    __slots__ = ("frames", "frame_time", "loop")
+
+    def __init__(self, frames: list[pg.Surface], frame_time: float, loop: bool = True):
+        """
+        引数1 frames：コマのSurfaceのリスト
+        引数2 frame_time：1コマの表示時間（秒）
+        引数3 loop：Trueなら最後のコマの次は最初のコマに戻る（Falseなら最後のコマで止まる）
+        """
+        self.frames = tuple(frames)
+        self.frame_time = frame_time
+        self.loop = loop
+
+    def duration(self) -> float:
+        """
+        戻り値：1周の長さ（秒）
+        """
+        return self.frame_time*len(self.frames)
+
+    def frame(self, t: float) -> pg.Surface:
+        """
+        引数 t：再生を始めてからの経過時間（秒）
+        戻り値：表示するコマのSurface
+        """
+        i = int(t/self.frame_time)
+        if self.loop:
+            i %= len(self.frames)
+        else:
+            i = min(i, len(self.frames)-1)
+        return self.frames[i]
+
+
+class Animator:
+    """
+    スプライトごとの再生状態（再生中のアニメーションと経過時間）だけを持つクラス
+    """
+    __slots__ = ("animation", "t")
+
+    def __init__(self, animation: Animation):
+        """
+        引数 animation：再生するAnimation
+        """
+        self.play(animation)
+
+    def play(self, animation: Animation):
+        """
+        animationを最初から再生する
+        引数 animation：再生するAnimation
+        """
+        self.animation = animation
+        self.t = 0.0
+
+    @property
+    def image(self) -> pg.Surface:
+        return self.animation.frame(self.t)
+
+    def update(self, dt: float) -> pg.Surface:
+        """
+        dt秒分再生を進める
+        引数 dt：進める時間（秒）
+        戻り値：表示するコマのSurface
+        """
+        self.t += dt
+        return self.animation.frame(self.t)
+
+    def done(self) -> bool:
+        """
+        戻り値：ループしないアニメーションを最後まで再生したかどうか
+        """
+        return not self.animation.loop and self.t >= self.animation.duration()
+
+
+class AnimationLibrary:
+    """
+    名前をつけて登録したアニメーションを，初めて使うときに一度だけ切り分け・変換して保持するクラス
+    登録するだけなら画像は読み込まない
+    """
+
+    def __init__(self, cache: AssetCache = ASSETS):
+        """
+        引数 cache：元の画像を読み込むAssetCache
+        """
+        self.cache = cache
+        self.specs = {}  # 名前 -> （コマの指定のリスト，1コマの表示時間，ループするか）
+        self.animations = {}  # 名前 -> Animation
+
+    def define(self, name: str, sources: list[tuple], frame_time: float, loop: bool = True):
+        """
+        アニメーションを登録する
+        引数1 name：アニメーションの名前
+        引数2 sources：（ファイル名，倍率，反転，角度，シートのコマ数）のタプルのリスト（2つ目以降は省略可）
+                      シートのコマ数が(1, 1)でなければ切り分けたコマをすべて順に加える
+        引数3 frame_time：1コマの表示時間（秒）
+        引数4 loop：ループするかどうか
+        """
+        self.specs[name] = (sources, frame_time, loop)
+        self.animations.pop(name, None)
+
+    def get(self, name: str) -> Animation:
+        """
+        引数 name：アニメーションの名前
+        戻り値：変換済みのAnimation
+        """
+        anim = self.animations.get(name)
+        if anim is None:
+            sources, frame_time, loop = self.specs[name]
+            frames = [img for source in sources for img in self._frames(*source)]
+            anim = self.animations[name] = Animation(frames, frame_time, loop)
+        return anim
+
+    def preload(self):
+        """
+        登録したアニメーションをすべて切り分け・変換しておく
+        """
+        for name in self.specs:
+            self.get(name)
+
+    def sources(self) -> list[tuple]:
+        """
+        戻り値：AssetCache.preload()に渡す，元の画像の指定のリスト
+        """
+        specs = []
+        for sources, _, _ in self.specs.values():
+            for name, scale, flip, angle, grid in (self._spec(*source) for source in sources):
+                if angle == 0 and grid == (1, 1):
+                    specs.append((name, scale, flip))
+                else:
+                    specs.append((name,))
+        return specs
+
+    @staticmethod
+    def _spec(name: str, scale: float = 1.0, flip: tuple[bool, bool] = (False, False), angle: float = 0,
+              grid: tuple[int, int] = (1, 1)) -> tuple:
+        return name, scale, tuple(flip), angle, tuple(grid)
+
+    def _frames(self, *source) -> list[pg.Surface]:
+        name, scale, flip, angle, grid = self._spec(*source)
+        if angle == 0 and grid == (1, 1):  # 1枚の画像ならAssetCacheの変換結果をそのまま共有する
+            return [self.cache.get(name, scale, flip)]
+        frames = []
+        for img in slice_sheet(self.cache.get(name), grid):  # 切り分けてからコマごとに変換する
+            if scale != 1.0 or angle != 0:
+                img = pg.transform.rotozoom(img, angle, scale)
+            if flip[0] or flip[1]:
+                img = pg.transform.flip(img, flip[0], flip[1])
+            if pg.display.get_surface() is not None:
+                img = img.convert_alpha()
+            frames.append(img.copy() if img.get_parent() is not None else img)
+        return frames
@@ -0,0 +1,126 @@
+import os
+
+import pygame as pg
+
+
+FIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fig")  # 画像ファイルを置いているディレクトリ（起動場所によらない）
+
+
+class AssetCache:
+    """
+    画像Surfaceを一度だけ読み込み，拡大縮小・反転・変換した結果を保持するクラス
+    キーは（ファイル名，倍率，反転）のタプル
+    """
+
+    def __init__(self, root: str = FIG_DIR):
+        """
+        引数 root：画像ファイルを探すディレクトリ
+        """
+        self.root = root
+        self.surfaces = {}  # (name, scale, flip) -> Surface
+        self.hits = 0  # キャッシュから返した回数
+        self.misses = 0  # ディスクから読み込んだ回数
+        self.preloaded = 0  # preload()までに読み込んだ回数
+        self.prefetched = 0  # put()で登録した（別スレッドで読み込んだ）枚数
+
+    def get(self, name: str, scale: float = 1.0, flip: tuple[bool, bool] = (False, False)) -> pg.Surface:
+        """
+        画像Surfaceを返す．初めて要求されたキーのときだけ読み込み・変換を行う
+        引数1 name：画像のファイル名
+        引数2 scale：rotozoomの倍率
+        引数3 flip：横方向，縦方向の反転有無タプル
+        戻り値：表示形式に変換済みのSurface
+        """
+        key = self.key(name, scale, flip)
+        img = self.surfaces.get(key)
+        if img is not None:
+            self.hits += 1
+            return img
+        self.misses += 1
+        img = self._convert(name, self.decode(*key))
+        self.surfaces[key] = img
+        return img
+
+    @staticmethod
+    def key(name: str, scale: float = 1.0, flip: tuple[bool, bool] = (False, False)) -> tuple:
+        """
+        戻り値：get()の引数に対応するキャッシュのキー
+        """
+        return (name, scale, tuple(flip))
+
+    def decode(self, name: str, scale: float = 1.0, flip: tuple[bool, bool] = (False, False)) -> pg.Surface:
+        """
+        画像を読み込み，拡大縮小・反転する（画面に触れないので別スレッドから呼べる）
+        引数はget()と同じ
+        戻り値：表示形式に変換していないSurface
+        """
+        img = pg.image.load(f"{self.root}/{name}")
+        if scale != 1.0:
+            img = pg.transform.rotozoom(img, 0, scale)
+        if flip[0] or flip[1]:
+            img = pg.transform.flip(img, flip[0], flip[1])
+        return img
+
+    def put(self, key: tuple, img: pg.Surface):
+        """
+        decode()した画像を表示形式に変換して登録する（メインスレッドから呼ぶ）
+        引数1 key：key()で作ったキー
+        引数2 img：decode()したSurface
+        """
+        if key not in self.surfaces:
+            self.surfaces[key] = self._convert(key[0], img)
+            self.prefetched += 1
+
+    def circle(self, color: tuple[int, int, int], rad: int) -> pg.Surface:
+        """
+        塗りつぶし円のSurfaceを返す．色と半径ごとに一度だけ描画する
+        引数1 color：円の色タプル
+        引数2 rad：円の半径
+        戻り値：黒をカラーキーにしたRLE加速済みのSurface
+        """
+        key = ("circle", tuple(color), rad)
+        img = self.surfaces.get(key)
+        if img is not None:
+            self.hits += 1
+            return img
+        self.misses += 1
+        img = pg.Surface((2*rad, 2*rad))
+        pg.draw.circle(img, color, (rad, rad), rad)
+        if pg.display.get_surface() is not None:
+            img = img.convert()
+        img.set_colorkey((0, 0, 0), pg.RLEACCEL)
+        self.surfaces[key] = img
+        return img
+
+    def preload(self, specs: list[tuple], progress=None):
+        """
+        ゲーム開始前に必要な画像をまとめて読み込む
+        引数1 specs：get()に渡す引数タプルのリスト（先頭が"circle"ならcircle()に渡す）
+        引数2 progress：1枚読み込むごとにprogress(読み込んだ数，全体の数)を呼ぶ関数（Noneなら呼ばない）
+        """
+        for i, spec in enumerate(specs):
+            if spec[0] == "circle":
+                self.circle(*spec[1:])
+            else:
+                self.get(*spec)
+            if progress is not None:
+                progress(i+1, len(specs))
+        self.preloaded = self.misses
+
+    def stats(self) -> dict:
+        """
+        戻り値：キャッシュの命中数，読み込み数，preload()後に読み込んだ数，別スレッドで読み込んだ数，保持している枚数の辞書
+        """
+        return {"hits": self.hits, "misses": self.misses, "late_misses": self.misses-self.preloaded,
+                "prefetched": self.prefetched, "entries": len(self.surfaces)}
+
+    def _convert(self, name: str, img: pg.Surface) -> pg.Surface:
+        if pg.display.get_surface() is not None:  # 画面生成後なら表示形式に変換しておく
+            if name.endswith(".jpg"):
+                img = img.convert()
+            else:
+                img = img.convert_alpha()
+        return img
+
+
+ASSETS = AssetCache()
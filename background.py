@@ -0,0 +1,85 @@
+import pygame as pg
+
+
+def bake(img: pg.Surface, size: tuple[int, int]) -> pg.Surface:
+    """
+    画像を画面の大きさに切り出し（足りない所は黒），表示形式に変換した背景Surfaceを作る
+    引数1 img：元の画像Surface
+    引数2 size：画面の幅と高さ
+    戻り値：sizeの大きさの背景Surface
+    """
+    surf = pg.Surface(size)
+    surf.blit(img, (0, 0))  # [0, 0]に置いたときに画面に映る範囲だけを残す
+    if pg.display.get_surface() is not None:
+        surf = surf.convert()
+    return surf
+
+
+class Layer:
+    """
+    横方向に並べて繰り返すタイル画像1枚と，そのスクロール速度を持つ背景の層
+    """
+    __slots__ = ("tile", "speed", "offset")
+
+    def __init__(self, tile: pg.Surface, speed: float = 0.0):
+        """
+        引数1 tile：繰り返し並べる画像Surface
+        引数2 speed：毎秒のスクロール量（正なら左へ流れる）
+        """
+        self.tile = tile
+        self.speed = speed
+        self.offset = 0.0  # タイルの左端からのずれ
+
+    def update(self, dt: float):
+        self.offset = (self.offset+self.speed*dt)%self.tile.get_width()
+
+    def draw(self, screen: pg.Surface, rect: pg.Rect):
+        """
+        rectの範囲に重なるタイルだけを，重なる部分を切り取って描画する
+        引数1 screen：描画先Surface
+        引数2 rect：描画する範囲
+        """
+        tw, th = self.tile.get_size()
+        x0 = rect.left-(rect.left+int(self.offset))%tw  # rect.leftを含むタイルの左端
+        y0 = rect.top-rect.top%th
+        for ty in range(y0, rect.bottom, th):
+            for tx in range(x0, rect.right, tw):
+                clip = rect.clip((tx, ty, tw, th))
+                screen.blit(self.tile, clip, clip.move(-tx, -ty))
+
+
+class Backdrop:
+    """
+    画面の大きさに焼き込んだ背景と，その上に重ねるスクロールする層をまとめて描くクラス
+    """
+
+    def __init__(self, img: pg.Surface, size: tuple[int, int], speed: float = 0.0, layers: list[Layer] = ()):
+        """
+        引数1 img：一番奥の背景画像Surface（画面の大きさに切り出して変換する）
+        引数2 size：画面の幅と高さ
+        引数3 speed：一番奥の背景の毎秒のスクロール量
+        引数4 layers：手前に重ねる層（奥から順）
+        """
+        self.size = size
+        self.layers = [Layer(bake(img, size), speed), *layers]
+        self.scrolling = any(layer.speed for layer in self.layers)  # 毎フレーム背景全体が変わるかどうか
+
+    def update(self, dt: float):
+        """
+        各層をdt秒分スクロールさせる
+        引数 dt：進める時間（秒）
+        """
+        if self.scrolling:
+            for layer in self.layers:
+                layer.update(dt)
+
+    def draw(self, screen: pg.Surface, rect: pg.Rect = None):
+        """
+        背景を描画する
+        引数1 screen：描画先Surface
+        引数2 rect：描画する範囲（Noneなら画面全体）
+        """
+        if rect is None:
+            rect = pg.Rect((0, 0), self.size)
+        for layer in self.layers:
+            layer.draw(screen, rect)
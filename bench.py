@@ -0,0 +1,240 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+import collision
+import engine
+import headless
+
+
+TICKS = 200  # 1シナリオで計測するフレーム数
+WARMUP = 20  # 計測前に捨てるフレーム数
+TOLERANCE = 1.2  # 基準値の何倍を超えたら遅くなったとみなすか
+NOISE_US = 20  # これより小さい差は誤差として無視する（マイクロ秒）
+SCENARIOS = {}  # シナリオ名 -> 設定
+
+
+def scenario(name: str, beams: int = 0, emys: int = 0, enemy_beams: int = 0, exps: int = 0,
+             boss: bool = False, boost: bool = False, hud_only: bool = False, precise: bool = False):
+    """
+    シナリオを登録する
+    引数1 name：シナリオ名
+    引数2-5 beams, emys, enemy_beams, exps：毎フレーム補充して保つビーム・敵・敵弾・爆発の数
+    引数6 boss：ラスボスを出すかどうか
+    引数7 boost：アイテム取得後のビーム加速（update 3回）を再現するかどうか
+    引数8 hud_only：HUDの描画だけを測るかどうか
+    引数9 precise：当たり判定でマスクによる精密な判定も行うかどうか
+    """
+    SCENARIOS[name] = {"beams": beams, "emys": emys, "enemy_beams": enemy_beams, "exps": exps,
+                       "boss": boss, "boost": boost, "hud_only": hud_only, "precise": precise}
+
+
+scenario("500 beams vs 50 enemies", beams=500, emys=50)
+scenario("500 beams vs 50 enemies, precise", beams=500, emys=50, boss=True, precise=True)
+scenario("boss fight with full-screen explosions", beams=100, exps=150, boss=True)
+scenario("item speed-up active", beams=200, emys=20, boost=True)
+scenario("1000 enemy beams", beams=100, emys=20, enemy_beams=1000)
+scenario("HUD-only", hud_only=True)
+
+
+class Bench:
+    """
+    Gameの中身をシナリオどおりに並べ，クラスごとのupdate・描画・当たり判定の1フレームあたりの時間を測るクラス
+    """
+
+    def __init__(self, variant: engine.Variant, conf: dict, screen: pg.Surface, seed: int):
+        """
+        引数1 variant：ゲームの種類（kill_kokaton.VARIANTなど）
+        引数2 conf：scenario()で登録した設定
+        引数3 screen：描画先Surface
+        引数4 seed：配置に使う乱数の種
+        """
+        self.variant = variant
+        self.conf = conf
+        cap = max(64, conf["beams"], conf["enemy_beams"], conf["exps"])
+        self.game = engine.Game(variant, pool_caps=dict.fromkeys(engine.POOL_CAPS, cap), seed=seed)
+        self.rng = self.game.rng
+        self.renderer = engine.Renderer(screen, self.game.background)
+        if conf["boss"]:
+            self.game.boss.add(engine.Last_boss())
+
+    def refill(self):
+        """
+        消えたスプライトを補充して，シナリオの数を保つ（計測には含めない）
+        """
+        g, rng, conf = self.game, self.rng, self.conf
+        w, h = engine.WIDTH, engine.HEIGHT
+        while len(g.beams) < conf["beams"]:
+            beam = g.spawn("beam", g.bird)
+            beam.rect.topleft = rng.randrange(w//2), rng.randrange(h-beam.rect.height)
+        while len(g.emys) < conf["emys"]:
+            emy = engine.Enemy(rng, self.variant)
+            emy.rect.topright = rng.randrange(w//2, w), rng.randrange(h-emy.rect.height)
+            emy.bound = 0  # すぐに停止状態にする
+            g.emys.add(emy)
+        if len(g.emys):
+            emys = g.emys.sprites()
+            while len(g.enemyBeams) < conf["enemy_beams"]:
+                emy_beam = g.spawn("enemy_beam", emys[rng.randrange(len(emys))], g.bird, rng)
+                emy_beam.rect.topleft = rng.randrange(w-20), rng.randrange(h-20)
+        while len(g.exps) < conf["exps"]:
+            g.spawn("explosion", g.bird, 100).rect.center = rng.randrange(w), rng.randrange(h)
+
+    def ops(self) -> list[tuple[str, callable]]:
+        """
+        戻り値：（計測名，1フレーム分の処理）のリスト
+        """
+        g, r = self.game, self.renderer
+        if self.conf["hud_only"]:
+            def hud_change():
+                g.score.score_up(1)  # 毎フレーム値が変わる場合
+                g.score.update(r)
+
+            return [
+                ("HUD.update", lambda: (g.score.update(r), g.life_gauge.update(r), g.boss_life.update(r))),
+                ("HUD.update changed", hud_change),
+                ("Renderer.flush", r.flush),
+            ]
+        times = 3 if self.conf["boost"] else 1
+        ops = [
+            ("Beam.update", lambda: [g.beams.update(i == 0) for i in range(times)]),
+            ("Beam.draw", lambda: r.draw(g.beams)),
+            ("Enemy.update", g.emys.update),
+            ("Enemy.draw", lambda: r.draw(g.emys)),
+            ("EnemyBeam.update", g.enemyBeams.update),
+            ("EnemyBeam.draw", lambda: r.draw(g.enemyBeams)),
+            ("Explosion.update", g.exps.update),
+            ("Explosion.draw", lambda: r.draw(g.exps)),
+            ("Last_boss.update", g.boss.update),
+            ("Last_boss.draw", lambda: r.draw(g.boss)),
+        ]
+        # 当たり判定はkillせずにコストだけを測る
+        grid = collision.SpatialHash()
+        narrow = self.narrow = collision.Narrowphase() if self.conf["precise"] else None
+
+        def collide():
+            grid.reset()
+            collision.groupcollide(g.emys, g.beams, False, False, grid, narrow)
+            collision.groupcollide(g.boss, g.beams, False, False, grid, narrow)
+            collision.groupcollide(g.enemyBeams, g.beams, False, False, grid, narrow)
+            collision.spritecollide(g.bird, g.enemyBeams, False, collided=narrow)
+
+        ops.append(("collide", collide))
+        ops.append(("Renderer.flush", r.flush))  # *.drawはキューに積むだけなので，描画はここで測る
+        return ops
+
+    def run(self, ticks: int) -> dict:
+        """
+        引数 ticks：計測するフレーム数
+        戻り値：計測名 -> {"mean_us", "p95_us"}の辞書
+        """
+        ops = self.ops()
+        samples = {name: [] for name, _ in ops}
+        for n in range(WARMUP+ticks):
+            self.refill()
+            self.renderer.begin()
+            for name, op in ops:
+                t = time.perf_counter_ns()
+                op()
+                if n >= WARMUP:
+                    samples[name].append(time.perf_counter_ns()-t)
+            self.renderer.end()
+        results = {name: _stats(ns) for name, ns in samples.items()}
+        if self.conf["precise"]:
+            results["narrowphase"] = self.narrow.stats()
+        return results
+
+
+def bench_main_loop(variant: engine.Variant, screen: pg.Surface, seed: int, ticks: int) -> dict:
+    """
+    自動操作でGame.stepとGame.drawを回し，メインループ1フレームあたりの時間を測る
+    """
+    game = engine.Game(variant, seed=seed)
+    renderer = engine.Renderer(screen, game.background)
+    pilot = headless.AutoPilot(seed)
+    samples = []
+    for n in range(WARMUP+ticks):
+        if game.result() is not None:
+            game = engine.Game(variant, seed=seed+n)
+        key_lst, shots, _ = pilot.poll(game)
+        t = time.perf_counter_ns()
+        game.step(key_lst, shots)
+        game.draw(renderer)
+        if n >= WARMUP:
+            samples.append(time.perf_counter_ns()-t)
+    return {"Game.step+draw": _stats(samples)}
+
+
+def _stats(ns: list[int]) -> dict:
+    ns = sorted(ns)
+    return {"mean_us": round(sum(ns)/len(ns)/1e3, 2), "p95_us": round(ns[int(len(ns)*0.95)]/1e3, 2)}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """
+    引数1 results：今回の結果
+    引数2 baseline：基準の結果
+    引数3 tolerance：許容する倍率
+    戻り値：平均時間が基準のtolerance倍を超え，差がNOISE_USより大きい計測の説明のリスト
+    """
+    slow = []
+    for name, ops in results.items():
+        for op, st in ops.items():
+            base = baseline.get(name, {}).get(op)
+            if base and "mean_us" in base and st["mean_us"] > base["mean_us"]*tolerance and st["mean_us"]-base["mean_us"] > NOISE_US:
+                slow.append(f"{name} / {op}: {base['mean_us']}us -> {st['mean_us']}us")
+    return slow
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="画面なしでシナリオごとの処理時間を測る")
+    parser.add_argument("--game", default="kill_kokaton", help="計測するゲームのモジュール名（VARIANTを持つもの）")
+    parser.add_argument("--scenario", action="append", default=None, help="計測するシナリオ名（複数指定可）")
+    parser.add_argument("--ticks", type=int, default=TICKS, help="1シナリオで計測するフレーム数")
+    parser.add_argument("--seed", type=int, default=0, help="配置に使う乱数の種")
+    parser.add_argument("--out", default=None, help="結果のJSONを書き出すパス")
+    parser.add_argument("--baseline", default=None, help="比べる基準の結果のJSON")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="基準の何倍を超えたら遅くなったとみなすか")
+    parser.add_argument("--list", action="store_true", help="シナリオ名を表示して終わる")
+    args = parser.parse_args()
+    names = [*SCENARIOS, "main loop"]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    pg.init()
+    variant = importlib.import_module(args.game).VARIANT
+    screen = pg.display.set_mode((engine.WIDTH, engine.HEIGHT))
+    variant.preload()
+    engine.ASSETS.preload(engine.BOSS_ASSETS)
+    results = {}
+    for name in args.scenario or names:
+        if name == "main loop":
+            results[name] = bench_main_loop(variant, screen, args.seed, args.ticks)
+        else:
+            results[name] = Bench(variant, SCENARIOS[name], screen, args.seed).run(args.ticks)
+    report = {"game": args.game, "ticks": args.ticks, "python": sys.version.split()[0],
+              "pygame": pg.version.ver, "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out is not None:
+        with open(args.out, "w") as f:
+            f.write(text+"\n")
+    print(text)
+    status = 0
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            slow = compare(results, json.load(f)["results"], args.tolerance)
+        for line in slow:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        status = 1 if slow else 0
+    pg.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+import collision
+
+
+WIDTH, HEIGHT = 1200, 600
+
+
+class Box(pg.sprite.Sprite):
+    """
+    当たり判定だけに使う矩形スプライト
+    """
+    def __init__(self, rng: random.Random, w: int, h: int):
+        super().__init__()
+        self.rect = pg.Rect(rng.randrange(WIDTH-w), rng.randrange(HEIGHT-h), w, h)
+
+
+def make_group(rng: random.Random, n: int, w: int, h: int) -> pg.sprite.Group:
+    return pg.sprite.Group(Box(rng, w, h) for _ in range(n))
+
+
+def measure(func, repeat: int) -> float:
+    """
+    引数1 func：計測する関数
+    引数2 repeat：繰り返し回数
+    戻り値：1回あたりの所要時間（マイクロ秒）
+    """
+    t = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter()-t)/repeat*1e6
+
+
+def main():
+    """
+    ビーム（groupb）と敵弾・敵（groupa）の数をそれぞれ変えながら，総当たりと空間ハッシュの所要時間を比べる
+    敵の数ごとに空間ハッシュの方が速くなった最小の組み合わせ数を求め，その中央値をBRUTE_FORCE_LIMITの目安として表示する
+    """
+    rng = random.Random(0)
+    sizes = [2, 5, 10, 20, 50, 100, 200, 500, 1000]
+    grid = collision.SpatialHash(limit=-1)  # 常に空間ハッシュを使わせる
+    print(f"{'beams':>6} {'targets':>7} {'pairs':>8} {'brute[us]':>10} {'hash[us]':>10}")
+    crossovers = []
+    for na in sizes:
+        targets = make_group(rng, na, 20, 20)
+        crossover = None
+        for nb in sizes:
+            beams = make_group(rng, nb, 40, 16)
+            repeat = max(5, 20000//(na*nb))
+
+            def brute():
+                pg.sprite.groupcollide(targets, beams, False, False)
+
+            def hashed():
+                grid.reset()  # 毎フレーム登録し直すコストも含める
+                collision.groupcollide(targets, beams, False, False, grid)
+
+            grid.reset()
+            expect = pg.sprite.groupcollide(targets, beams, False, False)
+            got = collision.groupcollide(targets, beams, False, False, grid)
+            assert {k: set(v) for k, v in expect.items()} == {k: set(v) for k, v in got.items()}
+            tb, th = measure(brute, repeat), measure(hashed, repeat)
+            print(f"{nb:>6} {na:>7} {na*nb:>8} {tb:>10.1f} {th:>10.1f}")
+            if crossover is None and th < tb:
+                crossover = na*nb
+        if crossover is not None:
+            crossovers.append(crossover)
+    crossovers.sort()
+    suggested = crossovers[len(crossovers)//2] if crossovers else None
+    print(f"crossover by targets: {crossovers} pairs")
+    print(f"suggested --brute-limit: {suggested} (BRUTE_FORCE_LIMIT = {collision.BRUTE_FORCE_LIMIT})")
+
+
+if __name__ == "__main__":
+    pg.init()
+    main()
+    pg.quit()
+    sys.exit()
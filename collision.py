@@ -0,0 +1,192 @@
+import time
+from collections import defaultdict
+
+import pygame as pg
+
+
+CELL = 64  # 空間ハッシュの1マスの大きさ（ピクセル）
+# 組み合わせ数がこれ以下なら総当たりで調べる（bench_collision.pyで測った境目は環境によって1600～4900組だったので，
+# どちらでも大きく外れない値にしている．実行する環境で測った値はSpatialHashのlimitや--brute-limitで渡す）
+BRUTE_FORCE_LIMIT = 3000
+
+
+class SpatialHash:
+    """
+    スプライトを一様グリッドのマスに振り分け，近くにあるものだけを当たり判定の候補にするクラス
+    """
+
+    def __init__(self, cell: int = CELL, limit: int = BRUTE_FORCE_LIMIT):
+        """
+        引数1 cell：1マスの大きさ
+        引数2 limit：groupcollide()でこの組み合わせ数以下なら空間ハッシュを使わず総当たりで調べる
+        """
+        self.cell = cell
+        self.limit = limit
+        self.cells = defaultdict(list)  # (マスx, マスy) -> [スプライト]
+        self.group = None  # 最後にbuild()したグループ
+
+    def reset(self):
+        """
+        登録内容を消す（フレームの初めに呼ぶ）
+        """
+        self.cells.clear()
+        self.group = None
+
+    def build(self, group: pg.sprite.AbstractGroup):
+        """
+        グループ内のスプライトを登録し直す
+        引数 group：登録するスプライトグループ
+        """
+        self.cells.clear()
+        self.group = group
+        c, cells = self.cell, self.cells
+        for sprite in group.sprites():
+            r = sprite.rect
+            for cx in range(r.left//c, (r.right-1)//c+1):
+                for cy in range(r.top//c, (r.bottom-1)//c+1):
+                    cells[cx, cy].append(sprite)
+
+    def query(self, rect: pg.Rect) -> list[pg.sprite.Sprite]:
+        """
+        引数 rect：調べる範囲
+        戻り値：rectと重なるマスに登録されているスプライトのリスト（重複なし）
+        """
+        c, cells = self.cell, self.cells
+        x0, x1 = rect.left//c, (rect.right-1)//c
+        y0, y1 = rect.top//c, (rect.bottom-1)//c
+        if x0 == x1 and y0 == y1:  # 1マスに収まるときは重複を取り除かなくてよい
+            return cells.get((x0, y0), [])
+        found = {}
+        for cx in range(x0, x1+1):
+            for cy in range(y0, y1+1):
+                for sprite in cells.get((cx, cy), ()):
+                    found[sprite] = None
+        return list(found)
+
+
+class MaskCache:
+    """
+    画像Surfaceごとにマスクを一度だけ作って保持するクラス
+    画像はAssetCacheやAnimationLibraryで共有されているので，スプライトの数によらずマスクは画像の数だけできる
+    """
+
+    def __init__(self):
+        self.masks = {}  # Surface -> Mask
+
+    def get(self, img: pg.Surface) -> pg.mask.Mask:
+        """
+        引数 img：画像Surface
+        戻り値：imgの不透明な部分（カラーキーの画像ならカラーキー以外）のマスク
+        """
+        mask = self.masks.get(img)
+        if mask is None:
+            mask = self.masks[img] = pg.mask.from_surface(img)
+        return mask
+
+
+MASKS = MaskCache()
+
+
+class Narrowphase:
+    """
+    rectが重なった組を，画像ごとのマスクで重なっているか調べ直すクラス
+    spritecollide()やgroupcollide()のcollidedに渡す．調べた組の数と1組あたりの時間を数える
+    """
+
+    def __init__(self, masks: MaskCache = MASKS):
+        """
+        引数 masks：マスクを取り出すMaskCache
+        """
+        self.masks = masks
+        self.pairs = 0  # 調べた組の数
+        self.rejected = 0  # rectは重なっていたがマスクは重なっていなかった組の数
+        self.ns = 0  # マスクの重なりを調べるのにかかった時間の合計（ナノ秒，マスクを作る時間は含まない）
+
+    def __call__(self, a: pg.sprite.Sprite, b: pg.sprite.Sprite) -> bool:
+        """
+        引数1 a：スプライト
+        引数2 b：aとrectが重なっているスプライト
+        戻り値：マスクが重なっているかどうか
+        """
+        ma, mb = self.masks.get(a.image), self.masks.get(b.image)  # 初めての画像ならここでマスクを作る
+        t = time.perf_counter_ns()
+        hit = ma.overlap(mb, (b.rect.x-a.rect.x, b.rect.y-a.rect.y)) is not None
+        self.ns += time.perf_counter_ns()-t
+        self.pairs += 1
+        if not hit:
+            self.rejected += 1
+        return hit
+
+    def stats(self) -> dict:
+        """
+        戻り値：調べた組の数，外れとした組の数，1組あたりの時間（マイクロ秒），作ったマスクの数の辞書
+        """
+        return {"pairs": self.pairs, "rejected": self.rejected,
+                "us_per_pair": round(self.ns/self.pairs/1e3, 2) if self.pairs else 0.0,
+                "masks": len(self.masks.masks)}
+
+
+def spritecollide(sprite: pg.sprite.Sprite, group: pg.sprite.AbstractGroup, dokill: bool,
+                  grid: SpatialHash = None, collided: Narrowphase = None) -> list[pg.sprite.Sprite]:
+    """
+    pg.sprite.spritecollideと同じ結果を返す当たり判定
+    引数1 sprite：判定するスプライト
+    引数2 group：相手のスプライトグループ
+    引数3 dokill：Trueなら当たった相手をkillする
+    引数4 grid：groupを登録済みの空間ハッシュ（登録されていなければ総当たり）
+    引数5 collided：rectが重なった組だけをさらに調べる関数（Noneならrectの重なりだけで判定する）
+    戻り値：spriteと重なった相手のリスト
+    """
+    if grid is None or grid.group is not group:  # 1体だけなら登録し直すより総当たりの方が速い
+        if collided is None:
+            return pg.sprite.spritecollide(sprite, group, dokill)
+        candidates = pg.sprite.spritecollide(sprite, group, False)
+    else:
+        rect, alive = sprite.rect, group.spritedict
+        candidates = [s for s in grid.query(rect) if s in alive and rect.colliderect(s.rect)]
+    crashed = candidates if collided is None else [s for s in candidates if collided(sprite, s)]
+    if dokill:
+        for s in crashed:
+            s.kill()
+    return crashed
+
+
+def groupcollide(groupa: pg.sprite.AbstractGroup, groupb: pg.sprite.AbstractGroup,
+                 dokilla: bool, dokillb: bool, grid: SpatialHash = None, collided: Narrowphase = None) -> dict:
+    """
+    pg.sprite.groupcollideと同じ結果を返す当たり判定
+    組み合わせ数がgridのlimit（gridがなければBRUTE_FORCE_LIMIT）より多いときはgroupbを空間ハッシュに登録し，
+    近くのスプライトだけを調べる
+    引数1 groupa：判定するスプライトグループ
+    引数2 groupb：相手のスプライトグループ
+    引数3 dokilla：Trueならgroupaの当たったスプライトをkillする
+    引数4 dokillb：Trueならgroupbの当たったスプライトをkillする
+    引数5 grid：使い回す空間ハッシュ（groupb以外を登録していれば作り直す）
+    引数6 collided：rectが重なった組だけをさらに調べる関数（Noneならrectの重なりだけで判定する）
+    戻り値：groupaのスプライトをキー，当たったgroupbのスプライトのリストを値とする辞書
+    """
+    if len(groupa)*len(groupb) <= (BRUTE_FORCE_LIMIT if grid is None else grid.limit):
+        if collided is None:
+            return pg.sprite.groupcollide(groupa, groupb, dokilla, dokillb)
+        query = lambda rect: groupb.sprites()  # 総当たり
+    else:
+        if grid is None:
+            grid = SpatialHash()
+        if grid.group is not groupb:
+            grid.build(groupb)
+        query = grid.query
+    crashed = {}
+    alive = groupb.spritedict  # killされたスプライトはここから消える
+    for a in groupa.sprites():
+        rect = a.rect
+        hits = [b for b in query(rect) if b in alive and rect.colliderect(b.rect)]
+        if collided is not None:
+            hits = [b for b in hits if collided(a, b)]
+        if hits:
+            if dokillb:
+                for b in hits:
+                    b.kill()
+            crashed[a] = hits
+            if dokilla:
+                a.kill()
+    return crashed
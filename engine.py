@@ -0,0 +1,1171 @@
+import argparse
+import asyncio
+import enum
+import itertools
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import pygame as pg
+
+import collision
+import governor
+import headless
+import replay
+import waves
+from animation import AnimationLibrary, Animator
+from assets import ASSETS
+from background import Backdrop
+from hud import HudLabel
+from loader import BackgroundLoader
+from pool import Pool, PooledSprite
+from profiler import FrameProfiler, NullProfiler
+from projectiles import ProjectileArray
+from render import DirtyRenderer, Renderer, switch
+from scores import SCORES, ScoreStore
+
+
+WIDTH = 1200  # ゲームウィンドウの幅
+HEIGHT = 600  # ゲームウィンドウの高さ
+SIM_HZ = 50  # 1秒あたりの処理回数（固定）
+DT = 1/SIM_HZ  # 1回の処理で進める時間（秒）
+MAX_FRAME = 0.25  # 1回の描画までに追いつく時間の上限（秒）
+RENDER_FPS = 60  # 描画の上限fps（0なら上限なし）
+POOL_CAPS = {"beam": 64, "enemy_beam": 256, "explosion": 64}  # 同時に存在できるビーム・敵弾・爆発の数
+POOL_POLICY = "oldest"  # 上限に達したら一番古いものを使い回す（"refuse"なら生成しない）
+VOLLEY_SPREAD = 40  # 一斉射撃で隣り合う敵弾の縦方向の速度差（毎秒）
+BOSS_SCORE = 100  # ラスボスが出現するスコア（ウェーブ定義にboss_scoreがなければこれを使う）
+PREFETCH_AT = 0.7  # ラスボスが出現するスコアのこの割合に達したらラスボス用の画像を別スレッドで読み込み始める
+ENEMY_INTERVAL = (50, 300)  # 敵の射撃インターバルの範囲（フレーム）
+HIT_DAMAGE = 50  # 敵弾に当たったときに減る体力
+BOSS_LIFE = 10  # ラスボスの体力
+FIRE, ITEM, ENEMY = 0, 1, 2  # WaveSchedulerでイベントを処理する段階（同じフレームではこの順）
+WAVE_PHASES = {"item": ITEM, "enemy": ENEMY}  # ウェーブ定義に書けるイベントの種類と段階
+END_DELAY = {"lose": 2.0, "clear": 3.0}  # 勝敗が決まってからウィンドウを閉じるまでの時間（秒）
+INPUT_HZ = 250  # main_async()で1秒あたりに入力を調べる回数
+FLUSH_EVERY = 1.0  # main_async()でプロファイルをファイルへ送る間隔（秒）
+SPRITE_LAYER, PROJECTILE_LAYER, HUD_LAYER, OVERLAY_LAYER = 0, 1, 2, 3  # 描画の層（小さい層から順に描く）
+EFFECTS = AnimationLibrary(ASSETS)  # 爆発のアニメーション（コマはすべてのスプライト・ゲームの種類で共有する）
+
+
+def check_bound(obj: pg.Rect) -> tuple[bool, bool]:
+    """
+    オブジェクトが画面内か画面外かを判定し，真理値タプルを返す
+    引数 obj：オブジェクト（爆弾，こうかとん，ビーム）SurfaceのRect
+    戻り値：横方向，縦方向のはみ出し判定結果（画面内：True／画面外：False）
+    """
+    yoko, tate = True, True
+    if obj.left < 0 or WIDTH < obj.right:  # 横方向のはみ出し判定
+        yoko = False
+    if obj.top < 0 or HEIGHT < obj.bottom:  # 縦方向のはみ出し判定
+        tate = False
+    return yoko, tate
+
+
+def calc_orientation(org: pg.Rect, dst: pg.Rect) -> tuple[float, float]:
+    """
+    orgから見て，dstがどこにあるかを計算し，方向ベクトルをタプルで返す
+    引数1 org：爆弾SurfaceのRect
+    引数2 dst：こうかとんSurfaceのRect
+    戻り値：orgから見たdstの方向ベクトルを表すタプル
+    """
+    x_diff, y_diff = dst.centerx-org.centerx, dst.centery-org.centery
+    norm = math.sqrt(x_diff**2+y_diff**2)
+    return x_diff/norm, y_diff/norm
+
+
+class Bird(pg.sprite.Sprite):
+    """
+    ゲームキャラクター（こうかとん）に関するクラス
+    """
+    delta = {  # 押下キーと移動量の辞書
+        pg.K_UP: (0, -1),
+        pg.K_DOWN: (0, +1),
+    }
+
+    def __init__(self, xy: tuple[int, int]):
+        """
+        こうかとん画像Surfaceを生成する
+        引数1 xy：こうかとん画像の位置座標タプル
+        """
+        super().__init__()
+        self.image = ASSETS.get("cat.png", 0.1, (True, False))  # デフォルトのこうかとん
+        self.dire = (+1, 0)
+        self.rect = self.image.get_rect()
+        self.rect.left = 0
+        self.px, self.py = self.rect.x, self.rect.y  # 直前のstep開始時の位置（描画の補間に使う）
+        self.speed = 500  # 毎秒の移動量
+
+
+    def update(self, key_lst: list[bool]):
+        """
+        押下キーに応じてこうかとんを移動させる
+        引数 key_lst：押下キーの真理値リスト
+        """
+        self.px, self.py = self.rect.x, self.rect.y
+        d = round(self.speed*DT)  # 1回の処理での移動量
+        sum_mv = [0, 0]
+        for k, mv in __class__.delta.items():
+            if key_lst[k]: 
+                self.rect.move_ip(+d*mv[0], +d*mv[1])
+                sum_mv[0] += mv[0]
+                sum_mv[1] += mv[1]
+        if check_bound(self.rect) != (True, True):
+            for k, mv in __class__.delta.items():
+                if key_lst[k]:
+                    self.rect.move_ip(-d*mv[0], -d*mv[1])
+        if not (sum_mv[0] == 0 and sum_mv[1] == 0):
+            self.dire = tuple(sum_mv)
+
+  
+    def get_direction(self) -> tuple[int, int]:
+        return self.dire
+
+
+class Beam(PooledSprite):
+    """
+    ビームに関するクラス
+    """
+    # 毎フレーム読み書きする値をスロットに置き，属性の読み書きを速くする
+    # （pg.sprite.Spriteに__slots__がないので__dict__は残り，メモリはほとんど減らない）
+    __slots__ = ("image", "rect", "px", "py", "vx", "vy", "speed")
+    base_speed = 1250  # 毎秒の移動量（既定値）
+
+    def __init__(self, bird: Bird):
+        """
+        引数に基づきビームSurfaceを生成する
+        引数 bird：ビームを放つこうかとん
+        """
+        super().__init__()
+        self.reset(bird)
+
+    def reset(self, bird: Bird):
+        """
+        ビームをbirdの前に置き直す（プールから再利用するとき）
+        引数 bird：ビームを放つこうかとん
+        """
+        self.image = ASSETS.get("beam.png", 2.0)
+        self.rect = self.image.get_rect()
+        self.rect.left = bird.rect.right
+        self.rect.centery = bird.rect.centery
+        self.px, self.py = self.rect.x, self.rect.y  # 使い回したときは古い位置から補間しない
+        self.vx, self.vy = +1, 0
+        self.speed = __class__.base_speed
+
+    def speedup(self,speed):
+        self.speed = speed
+
+    def update(self, first: bool = True):
+        """
+        ビームを速度ベクトルself.vx, self.vyに基づき移動させる
+        引数 first：そのstepで最初の移動ならTrue（アイテムがないと1回のstepで3回動くので，最初の位置だけ残す）
+        """
+        if first:
+            self.px, self.py = self.rect.x, self.rect.y
+        self.rect.move_ip(round(self.speed*self.vx*DT), 0)
+        if check_bound(self.rect) != (True, True):
+            self.kill()
+        
+
+class Item(pg.sprite.Sprite):   
+    """"
+    アイテムによって、攻撃スピードアップ
+
+    """
+    def __init__(self, rng: random.Random = random):
+     """
+     引数 rng：出現位置を決める乱数生成器
+     """
+     super().__init__()
+     self.image = ASSETS.get("22961558.png", 0.05)
+     self.rect = self.image.get_rect()
+     self.rect.left = WIDTH #
+     self.rect.centery = rng.randint(0,600)
+     self.px, self.py = self.rect.x, self.rect.y  # 直前のstep開始時の位置（描画の補間に使う）
+     self.vx, self.vy = -1, 0
+     self.speed = 750 #アイテムのスピード（毎秒）
+
+     
+    def update(self):
+        self.px, self.py = self.rect.x, self.rect.y
+        self.rect.move_ip(round(self.speed*self.vx*DT), round(self.speed*self.vy*DT))
+        #if check_bound(self.rect) != (True, True):
+           #self.life_guage +=10
+
+
+class Explosion(PooledSprite):
+    """
+    爆発に関するクラス
+    """
+    __slots__ = ("image", "rect", "px", "py", "anim", "life")
+
+    def __init__(self, obj: pg.sprite.Sprite, life: int):
+        """
+        爆弾が爆発するエフェクトを生成する
+        引数1 obj：爆発するスプライト（敵機・敵弾・ラスボス）
+        引数2 life：爆発時間
+        """
+        super().__init__()
+        self.anim = Animator(EFFECTS.get("explosion"))  # 再利用するときはplay()で最初のコマに戻す
+        self.reset(obj, life)
+
+    def reset(self, obj: pg.sprite.Sprite, life: int):
+        """
+        爆発をobjの位置で始め直す（プールから再利用するとき）
+        引数1 obj：爆発するスプライト（敵機・敵弾・ラスボス）
+        引数2 life：爆発時間
+        """
+        self.anim.play(EFFECTS.get("explosion"))
+        self.image = self.anim.image
+        self.rect = self.image.get_rect(center=obj.rect.center)
+        self.px, self.py = self.rect.x, self.rect.y  # 爆発は動かないので補間しても同じ位置
+        self.life = life
+
+    def update(self):
+        """
+        爆発時間_lifeを1減算し，経過時間に応じて爆発アニメーションのコマを切り替えることで
+        爆発エフェクトを表現する
+        """
+        self.life -= 1
+        self.image = self.anim.update(DT)
+        if self.life < 0:
+            self.kill() 
+
+
+class EnemyState(enum.IntEnum):
+    """
+    敵の状態
+    """
+    DOWN = 0  # 降下状態
+    STOP = 1  # 停止状態
+
+
+DOWN, STOP = EnemyState  # 毎フレーム比べるのでグローバル変数から引く（EnemyState.DOWNの属性参照は遅い）
+
+
+class Enemy(pg.sprite.Sprite):
+    """
+    敵に関するクラス
+    """
+    __slots__ = ("image", "rect", "px", "py", "anim", "num", "vy", "bound", "state", "score", "interval",
+                 "order", "stopped")
+    imgs = ["monster1.png", "monster2.png", "monster3.png"]  # 種類ごとの画像ファイル名（Variantの既定）
+
+    def __init__(self, rng: random.Random, variant: "Variant"):
+        """
+        引数1 rng：種類・停止位置・射撃インターバルを決める乱数生成器
+        引数2 variant：敵のアニメーションを持つゲームの種類
+        """
+        super().__init__()
+        self.num = rng.randint(0, 2)
+        self.anim = Animator(variant.animations.get(f"enemy{self.num}"))
+        self.image = self.anim.image
+        self.rect = self.image.get_rect()
+        self.rect.right = WIDTH
+        self.px, self.py = self.rect.x, self.rect.y  # 直前のstep開始時の位置（描画の補間に使う）
+        self.vy = +300  # 毎秒の降下量
+        self.bound = rng.randint(30, HEIGHT)  # 停止位置
+        self.state = DOWN
+        self.score = self.num+1
+        self.interval = rng.randint(*ENEMY_INTERVAL)  # Beam射撃インターバル
+        self.order = 0  # 出現順（同じフレームに撃つ敵はこの順に撃つ）
+        self.stopped = None  # 停止状態になったときに呼ぶ関数（射撃の予約に使う）
+
+    def update(self):
+        """
+        敵を速度ベクトルself.vyに基づき移動（降下）させる
+        ランダムに決めた停止位置_boundまで降下したら，_stateを停止状態に変更する（以後は動かさない）
+        引数 screen：画面Surface
+        """
+        self.px, self.py = self.rect.x, self.rect.y
+        if self.state is DOWN:
+            if self.rect.centery > self.bound:
+                if self.stopped is not None:
+                    self.stopped(self)
+                self.vy = 0
+                self.state = STOP
+            self.rect.centery += round(self.vy*DT)
+        self.image = self.anim.update(DT)
+
+
+class EnemyBeam(PooledSprite):
+    """
+    Enemyの攻撃に関するクラス
+    """
+    __slots__ = ("image", "rect", "px", "py", "vy", "speed")
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
+    speeds = [150, 300, 500]  # 敵の種類ごとの毎秒の移動量
+
+    def __init__(self, emy: "Enemy", bird: Bird, rng: random.Random = random):
+        """
+        爆弾円Surfaceを生成する
+        引数1 emy：爆弾を投下する敵機
+        引数2 bird：攻撃対象のこうかとん
+        引数3 rng：色と縦方向の速度を決める乱数生成器
+        """
+        super().__init__()
+        self.reset(emy, bird, rng)
+
+    def reset(self, emy: "Enemy", bird: Bird, rng: random.Random = random):
+        """
+        爆弾をemyの位置から撃ち直す（プールから再利用するとき）
+        引数1 emy：爆弾を投下する敵機
+        引数2 bird：攻撃対象のこうかとん
+        引数3 rng：色と縦方向の速度を決める乱数生成器
+        """
+        color = rng.choice(__class__.colors)  # 爆弾円の色：クラス変数からランダム選択
+        self.image = ASSETS.circle(color, 10)  # 色ごとに描画済みの円を共有する
+        self.rect = self.image.get_rect()
+        # 爆弾を投下するemyから見た攻撃対象のbirdの方向を計算
+        self.rect.centerx = emy.rect.centerx
+        self.rect.centery = emy.rect.centery
+        self.px, self.py = self.rect.x, self.rect.y  # 使い回したときは古い位置から補間しない
+        self.vy = 0  # 縦方向の毎秒の移動量
+        self.speed = __class__.speeds[emy.num]
+        if emy.num == 1:
+            self.vy = rng.randint(-1, 1)*50
+
+    def update(self):
+        """
+        爆弾を速度ベクトルself.vx, self.vyに基づき移動させる
+        引数 screen：画面Surface
+        """
+        self.px, self.py = self.rect.x, self.rect.y
+        self.rect.move_ip(-round(self.speed*DT), round(self.vy*DT))
+        if check_bound(self.rect) != (True, True):
+            self.kill()
+
+
+
+class Score:
+    """
+    打ち落とした爆弾，敵機の数をスコアとして表示するクラス
+    爆弾：1点
+    敵機：10点
+    """
+
+    def __init__(self, emy: Enemy):
+        super().__init__()
+        #im = random.randint(0, len(__class__.imgs))
+        self.color = (0, 0, 255)
+        self.score = 0
+        self.label = HudLabel("Score: ", self.score, self.color)
+        self.image = self.label.image
+        self.rect = self.image.get_rect()
+        self.rect.center = 100, HEIGHT-50
+
+    def score_up(self, add): #スコアを加算
+        self.score += add
+
+
+
+    def update(self, screen: pg.Surface):
+        self.label.set(self.score)  # 点数が変わったときだけ描画し直す
+        self.image = self.label.image
+        screen.blit(self.image, self.rect)
+
+class Last_boss(pg.sprite.Sprite):
+    """
+    ラスボス
+    """
+    def __init__(self):
+        super().__init__()
+        self.image = ASSETS.get("7.png", 3.0)
+        self.rect = self.image.get_rect()
+        self.rect.right = WIDTH
+        self.px, self.py = self.rect.x, self.rect.y  # 直前のstep開始時の位置（描画の補間に使う）
+        self.vy = +1
+        self.speed = 400  # 毎秒の移動量
+
+    def update(self):
+        self.px, self.py = self.rect.x, self.rect.y
+        self.rect.centery += self.vy * round(self.speed*DT)
+        # 画面端に到達したら方向を反転させる
+        if self.rect.bottom >= HEIGHT or self.rect.top <= 0:
+            self.vy *= -1
+
+
+class Boss_life:
+    """
+    ボスの体力
+    """
+    def __init__(self):
+        self.color = (255, 0, 0)
+        self.life = BOSS_LIFE
+        self.label = HudLabel("LIFE: ", self.life, self.color)
+        self.image = self.label.image
+        self.rect = self.image.get_rect()
+        self.rect.center = WIDTH-100, HEIGHT-50
+
+    def boss_lifes(self, dm):
+        self.life += dm
+
+    def update(self, screen: pg.Surface):
+        self.label.set(self.life)
+        self.image = self.label.image
+        screen.blit(self.image, self.rect)
+
+
+class Life_gauge: #体力ゲージに関するクラス
+    def __init__(self):  
+        self.color = (0, 0, 255)
+        self.life_guage = 100 #体力は100から消費する
+        self.label = HudLabel("Power: ", self.life_guage, self.color)
+        self.image = self.label.image
+        self.rect = self.image.get_rect()
+        self.rect.center = 300, HEIGHT-50
+       
+
+    def life_gauge_down(self, d): 
+        self.life_guage -= d #体力を引いていく
+        
+    def update(self, screen: pg.Surface):
+        self.label.set(self.life_guage)
+        self.image = self.label.image
+        screen.blit(self.image, self.rect)
+
+
+EFFECTS.define("explosion", [("explosion.gif",), ("explosion.gif", 1.0, (True, True))], 10*DT)
+PRELOAD = [  # ゲーム開始時に読み込む，どの種類のゲームでも使う画像（ファイル名，倍率，反転）
+    ("pg_bg.jpg",),
+    ("cat.png", 0.1, (True, False)),
+    ("beam.png", 2.0),
+    ("22961558.png", 0.05),
+    *EFFECTS.sources(),
+    *[("circle", color, 10) for color in EnemyBeam.colors],
+]
+BOSS_ASSETS = [  # ラスボス戦の画像（ゲーム中に別スレッドで読み込む）
+    ("pg_bg2.jpg", 2.0),
+    ("7.png", 3.0),
+]
+
+
+class Variant:
+    """
+    ゲームの種類ごとの設定（ウィンドウのタイトル，敵の画像と倍率）
+    敵のアニメーションは種類ごとに，その倍率で変換したものを持つ
+    """
+
+    def __init__(self, caption: str, enemy_scale: float, enemy_imgs: list[str] = None):
+        """
+        引数1 caption：ウィンドウのタイトル
+        引数2 enemy_scale：敵画像の倍率
+        引数3 enemy_imgs：3種類の敵の画像ファイル名（NoneならEnemy.imgs）
+        """
+        self.caption = caption
+        self.enemy_scale = enemy_scale
+        self.enemy_imgs = enemy_imgs or Enemy.imgs
+        self.animations = AnimationLibrary(ASSETS)  # 敵のアニメーション
+        for i, name in enumerate(self.enemy_imgs):
+            self.animations.define(f"enemy{i}", [(name, enemy_scale)], 0.5)  # コマを足せば動く敵になる
+
+    def preload(self, progress=None):
+        """
+        ゲーム開始時に使う画像をすべて読み込み，アニメーションを変換しておく
+        引数 progress：ASSETS.preload()に渡す，進み具合を受け取る関数
+        """
+        ASSETS.preload([*PRELOAD, *self.animations.sources()], progress)
+        EFFECTS.preload()
+        self.animations.preload()
+
+
+def loading_screen(screen: pg.Surface):
+    """
+    読み込みの進み具合をバーで表示する関数を返す（ASSETS.preload()のprogressに渡す）
+    引数 screen：画面Surface
+    戻り値：progress(読み込んだ数，全体の数)
+    """
+    font = pg.font.Font(None, 50)
+    bar = pg.Rect(100, HEIGHT//2, WIDTH-200, 20)
+
+    def progress(done: int, total: int):
+        pg.event.pump()  # 読み込み中もウィンドウが応答なしにならないようにする
+        screen.fill((0, 0, 0))
+        screen.blit(font.render(f"Loading... {done}/{total}", True, (255, 255, 255)), (bar.x, bar.y-50))
+        pg.draw.rect(screen, (255, 255, 255), bar, 1)
+        pg.draw.rect(screen, (255, 255, 255), (bar.x, bar.y, bar.w*done//total, bar.h))
+        pg.display.update()
+
+    return progress
+
+
+class Game:
+    """
+    ゲームの状態と1フレーム分の処理をまとめたクラス
+    処理（step）と描画（draw）を分けているので，画面なしでも進められる
+    """
+
+    def __init__(self, variant: Variant, pool_caps: dict = None, pool_policy: str = POOL_POLICY,
+                 projectiles: str = "sprite", volley: int = 1, seed: int = None, scroll: float = 0.0,
+                 precise: bool = False, wave_file: str = None, brute_limit: int = collision.BRUTE_FORCE_LIMIT):
+        """
+        引数1 variant：ゲームの種類
+        引数2 pool_caps：ビーム・敵弾・爆発のプールの上限（Noneなら既定値）
+        引数3 pool_policy：プールが上限に達したときの方針
+        引数4 projectiles："numpy"ならビームと敵弾をProjectileArrayで扱う
+        引数5 volley：敵が一度に撃つ弾の数
+        引数6 seed：このゲームの乱数の種（Noneならランダムに決める）
+        引数7 scroll：背景の毎秒のスクロール量（0ならスクロールしない）
+        引数8 precise：Trueならrectが重なった組をマスクで調べ直す（スプライトで扱う弾のみ）
+        引数9 wave_file：ウェーブ定義ファイルのパス（Noneなら既定のwaves.json）
+        引数10 brute_limit：当たり判定で空間ハッシュを使わず総当たりで調べる組み合わせ数の上限（結果は変わらない）
+        """
+        self.variant = variant
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = random.Random(seed)  # ゲーム中の乱数はすべてここから取る
+        caps = {**POOL_CAPS, **(pool_caps or {})}
+        self.options = {"pool_caps": caps, "pool_policy": pool_policy, "projectiles": projectiles, "volley": volley,
+                        "scroll": scroll, "precise": precise, "wave_file": wave_file}
+        self.background = Backdrop(ASSETS.get("pg_bg.jpg"), (WIDTH, HEIGHT), scroll)  # 画面の大きさに焼き込んだ背景
+        self.life_gauge = Life_gauge()
+        self.boss_life = Boss_life()
+        self.bird = Bird( (900, 400))
+        self.enemyBeams = pg.sprite.Group()
+        self.beams = pg.sprite.Group()
+        self.exps = pg.sprite.Group()
+        self.emys = pg.sprite.Group()
+        self.score = Score(self.emys)
+        self.boss = pg.sprite.Group()
+        self.pools = {
+            "beam": Pool(Beam, self.beams, caps["beam"], pool_policy),
+            "enemy_beam": Pool(EnemyBeam, self.enemyBeams, caps["enemy_beam"], pool_policy),
+            "explosion": Pool(Explosion, self.exps, caps["explosion"], pool_policy),
+        }
+        self.arrays = None  # ビームと敵弾のProjectileArray（スプライトで扱うときはNone）
+        if projectiles == "numpy":
+            self.arrays = {
+                "beam": ProjectileArray(caps["beam"], [ASSETS.get("beam.png", 2.0)], (WIDTH, HEIGHT)),
+                "enemy_beam": ProjectileArray(caps["enemy_beam"], [ASSETS.circle(c, 10) for c in EnemyBeam.colors],
+                                              (WIDTH, HEIGHT)),
+            }
+        self.volley = volley
+        self.grid = collision.SpatialHash(limit=brute_limit)  # ビームの位置を登録して当たり判定で使い回す
+        self.narrow = collision.Narrowphase() if precise else None  # マスクによる精密な当たり判定
+        self.item = None
+        self.num = 0
+        self.tmr = 0
+        self.boss_tick = None
+        self.hits = 0  # こうかとんが敵弾に当たった回数
+        self.damage = 0  # 敵弾に当たって減った体力の合計
+        wave = waves.load(wave_file or waves.WAVES, WAVE_PHASES)
+        self.boss_score = wave.get("boss_score", BOSS_SCORE)
+        self.waves = waves.WaveScheduler()  # 敵・アイテムの出現と敵の射撃の予定
+        for event in wave["events"]:
+            self.waves.schedule(event["at"], WAVE_PHASES[event["kind"]], event["kind"],
+                                every=event.get("every"), count=event.get("count"))
+        self.enemy_order = itertools.count()  # 敵の出現順（同じフレームに撃つ敵はこの順に撃つ）
+        self.effect_life = 1.0  # 爆発時間の倍率（Governorが重いときに短くする）
+        self.hud_every = 1  # HUDの数字を描き直すフレーム間隔（Governorが重いときに広げる）
+        self.draws = 0  # draw()した回数
+        self.prof = NullProfiler()  # 処理ごとの時間を測るときはFrameProfilerに差し替える
+        self.prof_font = None
+        self.loader = BackgroundLoader(ASSETS)  # ラスボス戦の画像を先読みする
+
+    def step(self, key_lst: list[bool], shots: int):
+        """
+        ゲームを1フレーム進める（描画はしない）
+        引数1 key_lst：押下キーの真理値リスト
+        引数2 shots：このフレームでスペースキーが押された回数
+        """
+        bird, beams, emys, enemyBeams, exps = self.bird, self.beams, self.emys, self.enemyBeams, self.exps
+        score, boss_life = self.score, self.boss_life
+        tmr = self.tmr
+        prof = self.prof
+        arrays = self.arrays
+        for _ in range(shots):
+            self.shoot()
+
+        for kind, data in self.waves.due(tmr, ITEM):
+            if kind == "fire":
+                if data.alive():  # 倒された敵の予定は捨てる
+                    # 敵機が停止状態に入ったら，intervalに応じて爆弾投下
+                    self.enemy_fire(data)
+                    self.waves.schedule(tmr+data.interval, FIRE, "fire", data, data.order)
+            else:
+                self.item = Item(self.rng)  # ウェーブ定義の間隔で，アイテムを出現させる
+
+        if self.item is not None:
+            if self.item.rect.colliderect(bird.rect):
+               self.item = None #アイテムに触れたらアイテムの表示を消す
+        prof.lap("spawn")
+
+        self.grid.reset()  # ビームが移動したのでフレームごとに登録し直す
+        if arrays is None:
+            crashed = collision.groupcollide(emys, beams, True, True, self.grid, self.narrow)
+        else:
+            crashed = arrays["beam"].groupcollide(emys, True, True)
+        for emy in crashed.keys():
+            self.explode(emy, 100)  # 爆発エフェクト
+            if emy.num == 0:
+                score.score_up(5) # 5点アップ
+            elif emy.num == 1:
+                score.score_up(10) # 10点アップ
+            elif emy.num == 2:
+                score.score_up(15) # 15点アップ
+        prof.lap("collide")
+
+        if score.score >= self.boss_score*PREFETCH_AT and self.num == 0:
+            self.loader.request(BOSS_ASSETS)  # 出現前に読み込みを済ませ，切り替え時に止まらないようにする
+        self.loader.poll()
+        if score.score >= self.boss_score and self.num == 0:
+            self.loader.finish()  # 読み込みが間に合っていなければここで待つ
+            self.background = Backdrop(ASSETS.get("pg_bg2.jpg", 2.0), (WIDTH, HEIGHT), self.options["scroll"])
+            self.boss.add(Last_boss())
+            self.num = 1
+            self.boss_tick = tmr  # ラスボスが出現したフレーム
+            self.waves.cancel("enemy")  # ラスボス戦では敵機を出さない
+        for _ in self.waves.due(tmr, ENEMY):
+            self.spawn_enemy()  # ウェーブ定義の間隔で，敵機を出現させる
+        prof.lap("spawn")
+
+        if boss_life.life >= 1:
+            if arrays is None:
+                crashed = collision.groupcollide(self.boss, beams, False, True, self.grid, self.narrow)
+            else:
+                crashed = arrays["beam"].groupcollide(self.boss, False, True)
+            for b in crashed.keys():
+                boss_life.boss_lifes(-1)
+                self.explode(b, 100)
+                if boss_life.life == 0:
+                    score.score_up(100)
+
+        if arrays is None:
+            hits = collision.groupcollide(enemyBeams, beams, True, True, self.grid, self.narrow).keys()
+        else:
+            hits = arrays["enemy_beam"].collide_array(arrays["beam"], True, True)
+        for enemyBeam in hits:
+            self.explode(enemyBeam, 50)  # 爆発エフェクト
+            score.score_up(1)  # 1点アップ
+
+        if arrays is None:
+            hits = collision.spritecollide(bird, enemyBeams, True, collided=self.narrow)
+        else:
+            hits = arrays["enemy_beam"].collide_rect(bird.rect, True)
+        if len(hits) != 0:
+            self.life_gauge.life_gauge_down(HIT_DAMAGE)
+            self.hits += 1
+            self.damage += HIT_DAMAGE
+        prof.lap("collide")
+
+        bird.update(key_lst)
+        self.move_beams()
+        emys.update()
+        if arrays is None:
+            enemyBeams.update()
+        else:
+            arrays["enemy_beam"].update(DT)
+        exps.update()
+        self.boss.update()
+        if self.item is not None:
+            self.item.update()
+        else:
+            self.move_beams(False)
+            self.move_beams(False)#ビームを加速させる
+        self.background.update(DT)
+        self.tmr += 1
+        prof.lap("update")
+
+    def shoot(self):
+        """
+        こうかとんの前にビームを1本出す
+        """
+        if self.arrays is None:
+            self.spawn("beam", self.bird)
+        else:
+            arr, rect = self.arrays["beam"], self.bird.rect
+            arr.spawn(rect.right, rect.centery-arr.sizes[0][1]//2, +1, 0, Beam.base_speed)
+
+    def spawn_enemy(self):
+        """
+        敵機を出現させ，停止したら射撃を予約するようにする
+        """
+        emy = Enemy(self.rng, self.variant)
+        emy.order = next(self.enemy_order)
+        emy.stopped = self.schedule_fire
+        self.emys.add(emy)
+
+    def schedule_fire(self, emy: Enemy):
+        """
+        停止した敵の最初の射撃を，intervalの倍数のフレームに予約する
+        引数 emy：停止した敵
+        """
+        t = self.tmr+1  # 停止したフレームの次から撃てる
+        self.waves.schedule(t+(-t)%emy.interval, FIRE, "fire", emy, emy.order)
+
+    def enemy_fire(self, emy: Enemy):
+        """
+        敵にvolley発の弾を撃たせる（2発以上なら縦方向に広げる）
+        引数 emy：弾を撃つ敵
+        """
+        for k in range(self.volley):
+            spread = (k-(self.volley-1)/2)*VOLLEY_SPREAD
+            if self.arrays is None:
+                emy_beam = self.spawn("enemy_beam", emy, self.bird, self.rng)
+                if emy_beam is not None:
+                    emy_beam.vy += spread
+            else:
+                kind = self.rng.randrange(len(EnemyBeam.colors))
+                speed = EnemyBeam.speeds[emy.num]
+                vy = (self.rng.randint(-1, 1)*50 if emy.num == 1 else 0)+spread
+                self.arrays["enemy_beam"].spawn(emy.rect.centerx-10, emy.rect.centery-10, -1, vy/speed, speed, kind)
+
+    def move_beams(self, first: bool = True):
+        """
+        こうかとんのビームを1回分動かす
+        引数 first：そのstepで最初の移動ならTrue（補間に使う位置を残す）
+        """
+        if self.arrays is None:
+            self.beams.update(first)
+        else:
+            self.arrays["beam"].update(DT)
+
+    def spawn(self, kind: str, *args) -> PooledSprite | None:
+        """
+        プールからビーム・敵弾・爆発を取り出して配置する
+        引数1 kind：プールの種類（"beam"，"enemy_beam"，"explosion"）
+        引数2 args：reset()に渡す引数
+        戻り値：配置したスプライト（上限で生成しなかったときはNone）
+        """
+        return self.pools[kind].spawn(*args)
+
+    def explode(self, obj: pg.sprite.Sprite, life: int):
+        """
+        objの位置に爆発エフェクトを出す
+        引数1 obj：爆発するスプライト
+        引数2 life：爆発時間（effect_lifeを掛けて使う）
+        """
+        self.spawn("explosion", obj, max(1, round(life*self.effect_life)))
+
+    def set_quality(self, quality: dict):
+        """
+        演出の品質を変える（ゲームの進行には影響しない）
+        引数 quality：governor.LEVELSの要素
+        """
+        self.effect_life = quality["effect_life"]
+        self.hud_every = quality["hud_every"]
+        cap = quality["explosions"]
+        self.pools["explosion"].set_cap(self.options["pool_caps"]["explosion"] if cap is None else cap)
+
+    def sprites(self) -> list[pg.sprite.Sprite]:
+        """
+        戻り値：描画順に並べた，動くスプライトのリスト
+        """
+        sprites = [self.bird]
+        for group in (self.beams, self.emys, self.enemyBeams, self.exps, self.boss):
+            sprites.extend(group)
+        if self.item is not None:
+            sprites.append(self.item)
+        return sprites
+
+    def draw(self, renderer: Renderer, alpha: float = 1.0):
+        """
+        現在の状態を描画する
+        スプライト・弾・HUDを層ごとにrendererのキューへ積み，最後に1回のblits()でまとめて描画する
+        引数1 renderer：描画に使うRenderer
+        引数2 alpha：直前のstepからの経過割合（0なら直前の位置，1なら現在の位置に描く）
+        """
+        if renderer.background is not self.background:  # ボス戦で背景が変わった
+            renderer.set_background(self.background)
+        renderer.begin()
+        renderer.layer = SPRITE_LAYER
+        seq = []
+        for sprite in self.sprites():
+            x, y = sprite.rect.x, sprite.rect.y
+            if alpha < 1.0:  # 直前のstep開始時の位置（各スプライトのupdateで残したもの）と現在の位置の間を補間する
+                x, y = round(sprite.px+(x-sprite.px)*alpha), round(sprite.py+(y-sprite.py)*alpha)
+            seq.append((sprite.image, (x, y)))
+        renderer.blits(seq)
+        if self.arrays is not None:
+            renderer.layer = PROJECTILE_LAYER
+            for arr in self.arrays.values():
+                renderer.blits(arr.blit_sequence((1.0-alpha)*DT))
+        self.prof.lap("draw")
+        renderer.layer = HUD_LAYER
+        refresh = self.draws%self.hud_every == 0
+        for hud in (self.score, self.life_gauge, self.boss_life):
+            if refresh:
+                hud.update(renderer)
+            else:  # 数字は描き直さず前の画像を使う
+                renderer.blit(hud.image, hud.rect)
+        self.draws += 1
+        if self.prof.show:  # F3キーで切り替えるプロファイラのオーバーレイ
+            if self.prof_font is None:
+                self.prof_font = pg.font.SysFont("monospace", 16)
+            img = self.prof.overlay(self.prof_font)
+            renderer.layer = OVERLAY_LAYER
+            renderer.blit(img, (WIDTH-img.get_width()-10, 10))
+        self.prof.lap("hud")
+        renderer.flush()  # 積んだ画像をまとめて描画する
+        self.prof.lap("draw")
+        renderer.end()
+        self.prof.lap("flip")
+
+    def counts(self) -> dict:
+        """
+        戻り値：グループ名 -> スプライト（弾）の数の辞書
+        """
+        counts = {"beams": len(self.beams), "emys": len(self.emys), "enemyBeams": len(self.enemyBeams),
+                  "exps": len(self.exps), "boss": len(self.boss)}
+        for kind, arr in (self.arrays or {}).items():
+            counts[kind] = len(arr)
+        return counts
+
+    def digest(self) -> int:
+        """
+        戻り値：現在の状態（フレーム数，スコア，体力，爆発以外の全スプライトと弾の位置）のCRC32
+        爆発はGovernorが実行環境の重さに応じて減らすので含めない
+        """
+        values = [self.tmr, self.score.score, self.life_gauge.life_guage, self.boss_life.life]
+        values += [sprite.rect.topleft for sprite in self.sprites() if not isinstance(sprite, Explosion)]
+        for arr in (self.arrays or {}).values():
+            values += [pos for _, pos in arr.blit_sequence()]
+        return replay.digest(values)
+
+    def result(self) -> str | None:
+        """
+        戻り値：体力が尽きたら"lose"，ボスを倒したら"clear"，続行中ならNone
+        """
+        if self.life_gauge.life_guage <= 0:
+            return "lose"
+        if self.boss_life.life == 0:
+            return "clear"
+        return None
+
+
+def prepare(variant: Variant, record: str = None, play: str = None, profile: str = None, overlay: bool = False,
+            **game_opts) -> tuple[Game, replay.Player | None, replay.Recorder | None]:
+    """
+    入力ログの再生・記録とプロファイラを用意してGameを作る（Sessionとheadlessで共有する）
+    引数1 variant：ゲームの種類
+    引数2 record：入力ログを書き出すパス
+    引数3 play：再生する入力ログのパス（記録時の種と設定でGameを作る）
+    引数4 profile：処理ごとの所要時間をJSON Linesで書き出すパス
+    引数5 overlay：TrueならprofileがなくてもF3キーのオーバーレイ用にFrameProfilerを使う
+    引数6 game_opts：Gameに渡す設定
+    戻り値：Game，Player（再生しないならNone），Recorder（記録しないならNone）のタプル
+    """
+    player = None
+    if play is not None:
+        player = replay.Player(play)
+        game_opts.update(player.options, seed=player.seed)
+    game = Game(variant, **game_opts)
+    recorder = replay.Recorder(record, game.seed, game.options) if record is not None else None
+    if profile is not None or overlay:
+        game.prof = FrameProfiler(profile)
+    return game, player, recorder
+
+
+def finish(game: Game, player: replay.Player | None, recorder: replay.Recorder | None) -> str | None:
+    """
+    prepare()で用意したプロファイル・入力ログを書き終える
+    引数1 game：終えたGame
+    引数2 player：再生に使ったPlayer
+    引数3 recorder：記録に使ったRecorder
+    戻り値：再生したときはreplay.verify()の結果，それ以外はNone
+    """
+    game.prof.close()
+    if recorder is not None:
+        recorder.close(game.digest())
+    return replay.verify(player, game) if player is not None else None
+
+
+class Session:
+    """
+    ウィンドウで遊ぶ1試合分の状態（Game，描画，入力ログの記録・再生，プロファイラ，ガバナー，記録の保存）をまとめるクラス
+    main()とmain_async()で共有する
+    """
+
+    def __init__(self, variant: Variant, dirty: bool = False, budget: float = None, governor_log: str = None,
+                 scores: str = None, **opts):
+        """
+        ウィンドウを開き，画像を読み込んでGameを作る
+        引数1 variant：ゲームの種類
+        引数2 dirty：Trueなら変化した範囲だけを描き直して転送する
+        引数3 budget：1フレームの処理時間の予算（ミリ秒）．指定すると超えたときに演出の品質を下げる
+        引数4 governor_log：品質を変えた記録をJSON Linesで書き出すパス
+        引数5 scores：試合の記録を保存するデータベースのパス（Noneなら保存しない）
+        引数6 opts：prepare()に渡す入力ログ・プロファイル・Gameの設定
+        """
+        self.variant = variant
+        pg.display.set_caption(variant.caption)
+        screen = pg.display.set_mode((WIDTH, HEIGHT))
+        # ウィンドウを先に出し，進み具合を表示しながらゲーム中に使う画像をすべて読み込む
+        variant.preload(loading_screen(screen))
+        self.game, self.player, self.recorder = prepare(variant, overlay=True, **opts)
+        self.prof = self.game.prof
+        self.dirty = dirty
+        self.renderer = (DirtyRenderer if dirty else Renderer)(screen, self.game.background)
+        self.gov = governor.Governor(budget, governor_log) if budget is not None else None
+        # 入力ログの再生は新しい試合ではないので保存しない
+        self.store = None
+        if scores is not None and self.player is None:
+            try:
+                self.store = ScoreStore(scores)
+            except sqlite3.Error as e:  # 書き込めない場所でもゲームは遊べるようにする
+                print(f"scores: not saved ({scores}: {e})", file=sys.stderr)
+        self.running = True
+        self.end_at = None  # 勝敗が決まってからウィンドウを閉じる時刻（秒）
+        self.started = time.perf_counter()
+        self.played = None  # 勝敗が決まった時点の試合時間（秒）と1フレームの処理時間のパーセンタイル
+
+    def handle(self, event: pg.event.Event) -> int:
+        """
+        イベントを1つ処理する
+        引数 event：pg.event.get()で取り出したイベント
+        戻り値：スペースキーで撃った数（0か1）
+        """
+        if event.type == pg.QUIT:
+            self.running = False
+        elif event.type == pg.KEYDOWN and event.key == pg.K_SPACE:
+            return 1
+        elif event.type == pg.KEYDOWN and event.key == pg.K_F3:
+            self.prof.show = not self.prof.show
+        return 0
+
+    def tick(self, key_lst: list[bool], shots: int) -> bool:
+        """
+        ゲームをDTだけ進める（再生中は入力をログから取り，記録中は入力をログに書く）
+        引数1 key_lst：押下キーの真理値リスト
+        引数2 shots：前の処理から撃った数
+        戻り値：進めたかどうか（終了した，勝敗が決まった，ログを再生し終えたならFalse）
+        """
+        if not self.running or self.game.result() is not None:
+            return False
+        if self.player is not None:
+            key_lst, shots, end = self.player.poll(self.game)
+            if end:
+                self.running = False
+                return False
+        if self.recorder is not None:
+            shots = min(shots, replay.MAX_SHOTS)  # ログに残せる回数に揃える
+            self.recorder.record(replay.encode(key_lst, shots))
+        self.game.step(key_lst, shots)
+        return True
+
+    def draw(self, alpha: float):
+        """
+        描画してフレームを締め，ガバナーが品質を変えたら演出と描画クラスを切り替える
+        引数 alpha：直前のstepからの経過割合
+        """
+        self.game.draw(self.renderer, alpha)
+        self.prof.end(self.game.counts())
+        if self.gov is not None and self.gov.observe(self.prof.phases["total"]/1e6):
+            quality = self.gov.quality
+            self.game.set_quality(quality)
+            self.renderer = switch(self.renderer, DirtyRenderer if self.dirty or quality["dirty"] else Renderer)
+
+    def check_end(self, now: float):
+        """
+        勝敗が決まったらEND_DELAY秒後に終えるよう時刻を決め，その時刻を過ぎたら終える
+        （待つ間も描画とイベントの処理を続けるので，ウィンドウは止まらない）
+        引数 now：今の時刻（秒）
+        """
+        result = self.game.result()
+        if result is not None and self.end_at is None:
+            self.settle()
+            self.end_at = now+END_DELAY[result]
+        if self.end_at is not None and now >= self.end_at:
+            self.running = False
+
+    def settle(self):
+        """
+        試合時間と1フレームの処理時間を記録に残す値として確定する
+        勝敗が決まったときに呼び，その後のEND_DELAYの待ち（描画だけのフレーム）を含めない
+        """
+        if self.played is None:
+            self.played = (time.perf_counter()-self.started, self.prof.summary().get("total", {}))
+
+    def close(self) -> float:
+        """
+        入力ログ・プロファイル・ガバナーの記録を書き終え，試合の記録を保存する
+        戻り値：1フレームあたりの平均転送ピクセル数
+        """
+        if self.store is not None:
+            self.settle()  # 勝敗が決まる前に閉じたときはここまでの値を使う
+            game, (seconds, frame) = self.game, self.played
+            self.store.submit({"variant": self.variant.caption, "seed": game.seed, "result": game.result(),
+                               "score": game.score.score, "boss_killed": game.result() == "clear",
+                               "frames": game.tmr, "seconds": round(seconds, 2),
+                               "frame_p50": frame.get("p50"), "frame_p95": frame.get("p95"),
+                               "frame_p99": frame.get("p99")})
+            self.store.close()  # まだ書いていない記録を書き終えるまで待つ
+            print(f"scores: {self.store.written} saved to {self.store.path}")
+        verified = finish(self.game, self.player, self.recorder)
+        if verified is not None:
+            print(f"replay: {verified}")
+        if self.gov is not None:
+            self.gov.close()
+            print(f"governor: {len(self.gov.decisions)} decisions, final level {self.gov.quality['name']}")
+        return self.renderer.average_pixels()
+
+
+def main(variant: Variant, fps: int = RENDER_FPS, **opts) -> float:
+    """
+    ゲームのメインループ
+    処理はDTごとの固定間隔で進め，描画は経過時間に応じて補間した位置に行う
+    引数1 variant：ゲームの種類
+    引数2 fps：描画の上限fps（0なら上限なし）
+    引数3 opts：Sessionに渡す設定
+    戻り値：1フレームあたりの平均転送ピクセル数
+    """
+    session = Session(variant, **opts)
+    prof = session.prof
+    clock = pg.time.Clock()
+    acc = 0.0  # まだ処理していない経過時間（秒）
+    shots = 0  # 前の処理から撃った数（処理しない描画フレームをまたいで持ち越す）
+    while session.running:
+        acc += min(clock.tick(fps)/1000, MAX_FRAME)  # 遅すぎるフレームは打ち切って追いつく
+        prof.start()
+        key_lst = pg.key.get_pressed()
+        for event in pg.event.get():
+            shots += session.handle(event)
+        prof.lap("events")
+        while acc >= DT and session.tick(key_lst, shots):
+            shots = 0
+            acc -= DT
+        session.draw(min(acc/DT, 1.0))
+        session.check_end(time.perf_counter())
+    return session.close()
+
+
+async def main_async(variant: Variant, fps: int = RENDER_FPS, jobs: tuple = (), **opts) -> float:
+    """
+    main()と同じゲームを，入力・処理・描画・裏方の仕事に分けたasyncioのタスクで動かす
+    入力は毎秒INPUT_HZ回，処理はDTごと，描画はfpsごとに行い，勝敗が決まってからの待ちはタイマーで行う
+    引数1 variant：ゲームの種類
+    引数2 fps：描画の上限fps（0なら上限なし）
+    引数3 jobs：Sessionを受け取り，session.runningの間動き続けるコルーチン関数
+    引数4 opts：Sessionに渡す設定
+    戻り値：1フレームあたりの平均転送ピクセル数
+    """
+    session = Session(variant, **opts)
+    prof, game = session.prof, session.game
+    loop = asyncio.get_running_loop()
+    shots = 0  # 前の処理から撃った数
+    last_tick = loop.time()  # 最後に処理した時刻（描画の補間に使う）
+    finished = asyncio.Event()  # 処理のタスクが終わった（長く待つタスクはこれを待って抜ける）
+
+    def stop():
+        session.running = False
+
+    async def poll_input():  # フレームを待たずにイベントを取り出すので，撃った入力が次の処理に間に合う
+        nonlocal shots
+        while session.running:
+            prof.skip()
+            for event in pg.event.get():
+                shots += session.handle(event)
+            prof.lap("events")
+            await asyncio.sleep(1/INPUT_HZ)
+
+    async def simulate():
+        nonlocal shots, last_tick
+        next_tick = loop.time()
+        while session.running:
+            await asyncio.sleep(max(0.0, next_tick-loop.time()))
+            if loop.time()-next_tick > MAX_FRAME:  # 遅れすぎたら追いつくのをあきらめる
+                next_tick = loop.time()
+            prof.skip()
+            if session.tick(pg.key.get_pressed(), shots):
+                shots = 0
+            elif session.end_at is None and game.result() is not None:
+                session.settle()
+                session.end_at = loop.time()+END_DELAY[game.result()]
+                loop.call_later(END_DELAY[game.result()], stop)  # 待つ間も入力と描画のタスクは動き続ける
+            last_tick = next_tick
+            next_tick += DT
+        finished.set()
+
+    async def render():
+        next_frame = loop.time()
+        while session.running:
+            await asyncio.sleep(max(0.0, next_frame-loop.time()))
+            next_frame = max(next_frame+(1/fps if fps else 0.0), loop.time()-MAX_FRAME)
+            prof.skip()
+            session.draw(min((loop.time()-last_tick)/DT, 1.0))
+            prof.start()
+
+    async def flush_logs():  # FLUSH_EVERY秒待つ途中でも，処理が終わったらすぐに抜ける
+        while not finished.is_set():
+            try:
+                await asyncio.wait_for(finished.wait(), FLUSH_EVERY)
+            except asyncio.TimeoutError:
+                prof.flush()
+
+    prof.start()
+    await asyncio.gather(poll_input(), simulate(), render(), flush_logs(), *(job(session) for job in jobs))
+    return session.close()
+
+
+def cli(variant: Variant):
+    """
+    コマンドライン引数に従ってゲームを起動する（各ゲームの入口から呼ぶ）
+    引数 variant：ゲームの種類
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dirty", action="store_true", help="変化した範囲だけを描き直して転送する")
+    parser.add_argument("--fps", type=int, default=RENDER_FPS, help="描画の上限fps（0なら上限なし）")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="入力・処理・描画をasyncioのタスクに分けたループで動かす")
+    parser.add_argument("--headless", action="store_true", help="画面なしで全速でシミュレーションする")
+    parser.add_argument("--render", action="store_true", help="headless時もダミーの画面に描画する")
+    parser.add_argument("--frames", type=int, default=10000, help="headless時の最大フレーム数")
+    parser.add_argument("--pool-cap", type=int, default=None, help="ビーム・敵弾・爆発それぞれの同時に存在できる数")
+    parser.add_argument("--pool-policy", choices=Pool.policies, default=POOL_POLICY,
+                        help="上限に達したとき古いものを使い回す（oldest）か生成しない（refuse）か")
+    parser.add_argument("--projectiles", choices=["sprite", "numpy"], default="sprite",
+                        help="numpyならビームと敵弾をNumPyの配列でまとめて処理する")
+    parser.add_argument("--volley", type=int, default=1, help="敵が一度に撃つ弾の数（弾幕用）")
+    parser.add_argument("--waves", default=None, help="ウェーブ定義ファイル（JSON）のパス")
+    parser.add_argument("--precise", action="store_true", help="rectが重なった組をマスクで調べ直す")
+    parser.add_argument("--brute-limit", type=int, default=collision.BRUTE_FORCE_LIMIT,
+                        help="当たり判定を総当たりで調べる組み合わせ数の上限（bench_collision.pyで測った値を渡す）")
+    parser.add_argument("--scroll", type=float, default=0.0, help="背景の毎秒のスクロール量")
+    parser.add_argument("--seed", type=int, default=None, help="乱数の種")
+    parser.add_argument("--record", default=None, help="入力ログを書き出すパス")
+    parser.add_argument("--replay", default=None, help="入力ログを記録時の種と設定で再生する")
+    parser.add_argument("--profile", default=None, help="処理ごとの所要時間などを1フレーム1行のJSONで書き出すパス")
+    parser.add_argument("--budget", type=float, default=None,
+                        help=f"1フレームの処理時間の予算（ミリ秒，例：{1000/SIM_HZ:g}）．超え続けたら演出を軽くする")
+    parser.add_argument("--governor-log", default=None, help="演出の品質を変えた記録を1件1行のJSONで書き出すパス")
+    parser.add_argument("--scores", default=SCORES, help="試合の記録を保存するデータベースのパス（空文字なら保存しない）")
+    args = parser.parse_args()
+    game_opts = {"pool_policy": args.pool_policy, "projectiles": args.projectiles, "volley": args.volley,
+                 "scroll": args.scroll, "precise": args.precise, "wave_file": args.waves,
+                 "brute_limit": args.brute_limit,
+                 "seed": args.seed, "record": args.record, "play": args.replay, "profile": args.profile}
+    if args.pool_cap is not None:
+        if args.pool_cap < 1:
+            parser.error(f"--pool-cap must be at least 1: {args.pool_cap}")
+        game_opts["pool_caps"] = dict.fromkeys(POOL_CAPS, args.pool_cap)
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"  # ウィンドウを開かない
+    pg.init()
+    if args.headless:
+        renderer = None
+        if args.render:  # ダミーの画面に描画して描画のコストも含めて測る
+            screen = pg.display.set_mode((WIDTH, HEIGHT))
+        variant.preload()
+        game, player, recorder = prepare(variant, **game_opts)
+        source = player or headless.AutoPilot(game.seed)
+        if recorder is not None:
+            source = replay.Recording(source, recorder)
+        if args.render:
+            renderer = (DirtyRenderer if args.dirty else Renderer)(screen, game.background)
+        report = headless.run(game, source, args.frames, renderer)
+        verified = finish(game, player, recorder)
+        if verified is not None:
+            report["replay"] = verified
+        print(report)
+    else:
+        opts = {"dirty": args.dirty, "fps": args.fps, "budget": args.budget, "governor_log": args.governor_log,
+                "scores": args.scores or None, **game_opts}
+        pixels = asyncio.run(main_async(variant, **opts)) if args.use_async else main(variant, **opts)
+        print(f"pixels/frame: {pixels:.0f}")  # 1フレームあたりの平均転送ピクセル数
+    print(f"assets: {ASSETS.stats()}")  # late_missesが0ならゲーム中の読み込みなし
+    pg.quit()
+    sys.exit()
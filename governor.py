@@ -0,0 +1,83 @@
+import json
+
+
+HIGH = 0.9  # 平均処理時間が予算のこの割合を超えたら重すぎる
+LOW = 0.5  # 平均処理時間が予算のこの割合を下回ったら余裕がある
+SMOOTH = 0.1  # 処理時間の指数移動平均の重み
+DEGRADE_AFTER = 15  # 重すぎるフレームがこれだけ続いたら品質を1段階下げる
+RESTORE_AFTER = 120  # 余裕のあるフレームがこれだけ続いたら品質を1段階戻す
+LEVELS = [  # 品質の段階（下へ行くほど軽い）
+    {"name": "full", "effect_life": 1.0, "explosions": None, "hud_every": 1, "dirty": False},
+    {"name": "short_effects", "effect_life": 0.5, "explosions": None, "hud_every": 1, "dirty": False},
+    {"name": "cap_explosions", "effect_life": 0.5, "explosions": 16, "hud_every": 1, "dirty": False},
+    {"name": "skip_hud", "effect_life": 0.5, "explosions": 16, "hud_every": 10, "dirty": False},
+    {"name": "dirty", "effect_life": 0.5, "explosions": 16, "hud_every": 10, "dirty": True},
+]
+
+
+class Governor:
+    """
+    1フレームの処理時間を見張り，予算を超え続けたら演出の品質を下げ，余裕が続いたら戻すクラス
+    品質の段階はLEVELS．決めたことはすべてdecisionsに残し，1件1行のJSONで書き出す
+    """
+
+    def __init__(self, budget_ms: float, log: str = None, high: float = HIGH, low: float = LOW):
+        """
+        引数1 budget_ms：1フレームの処理時間の予算（ミリ秒）
+        引数2 log：決めたことを書き出すパス（Noneなら書き出さない）
+        引数3 high：予算のこの割合を超えたら重すぎるとみなす
+        引数4 low：予算のこの割合を下回ったら余裕があるとみなす
+        """
+        self.budget = budget_ms
+        self.high = high
+        self.low = low
+        self.level = 0
+        self.avg = 0.0  # 処理時間の指数移動平均（ミリ秒）
+        self.over = 0  # 重すぎるフレームが続いた数
+        self.under = 0  # 余裕のあるフレームが続いた数
+        self.frames = 0
+        self.decisions = []
+        self.out = open(log, "w") if log is not None else None
+
+    @property
+    def quality(self) -> dict:
+        """
+        戻り値：今の品質の段階（LEVELSの要素）
+        """
+        return LEVELS[self.level]
+
+    def observe(self, ms: float) -> bool:
+        """
+        1フレームの処理時間を記録し，必要なら品質の段階を変える
+        引数 ms：そのフレームの処理時間（ミリ秒，clock.tickで待った時間は含まない）
+        戻り値：品質の段階を変えたかどうか
+        """
+        self.frames += 1
+        self.avg = ms if self.frames == 1 else self.avg+(ms-self.avg)*SMOOTH
+        self.over = self.over+1 if self.avg > self.budget*self.high else 0
+        self.under = self.under+1 if self.avg < self.budget*self.low else 0
+        if self.over >= DEGRADE_AFTER and self.level < len(LEVELS)-1:
+            self._change(self.level+1, ms, "over budget")
+            return True
+        if self.under >= RESTORE_AFTER and self.level > 0:
+            self._change(self.level-1, ms, "headroom")
+            return True
+        return False
+
+    def close(self):
+        """
+        ログの書き出しを終える
+        """
+        if self.out is not None:
+            self.out.close()
+
+    def _change(self, level: int, ms: float, reason: str):
+        decision = {"frame": self.frames, "ms": round(ms, 3), "avg_ms": round(self.avg, 3),
+                    "budget_ms": self.budget, "from": LEVELS[self.level]["name"], "to": LEVELS[level]["name"],
+                    "reason": reason}
+        self.decisions.append(decision)
+        if self.out is not None:
+            self.out.write(json.dumps(decision)+"\n")
+            self.out.flush()
+        self.level = level
+        self.over = self.under = 0
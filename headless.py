@@ -0,0 +1,97 @@
+import random
+import time
+from collections import deque
+
+import pygame as pg
+
+
+class AutoPilot:
+    """
+    画面なしで遊ばせるための自動操作
+    先頭の敵（いなければボス）と同じ高さへ移動しながら，一定間隔でビームを撃つ
+    反応の遅れ・狙いのずれ・撃ち控えを指定すると，敵が撃ち返せる程度に下手になる（既定は正確な操作）
+    """
+
+    def __init__(self, seed: int = None, interval: int = 5, reaction: int = 0, aim_error: int = 0,
+                 hold: float = 0.0):
+        """
+        引数1 seed：撃つタイミング・狙いのずれ・撃ち控えを決める乱数の種
+        引数2 interval：ビームを撃つおおよそのフレーム間隔
+        引数3 reaction：反応の遅れ（何フレーム前の狙う高さへ移動するか）
+        引数4 aim_error：狙う高さのずれの最大（ピクセル．狙う相手が変わるたびに決め直す）
+        引数5 hold：撃てるときに撃たない確率
+        """
+        self.rng = random.Random(seed)
+        self.interval = interval
+        self.aim_error = aim_error
+        self.hold = hold
+        self.wait = 0
+        self.target = None  # 狙っている相手
+        self.offset = 0  # 狙う高さのずれ
+        self.goals = deque(maxlen=reaction+1)  # 直近の狙う高さ（先頭がreactionフレーム前）
+
+    def poll(self, game) -> tuple[dict, int, bool]:
+        """
+        引数 game：操作対象のGame
+        戻り値：押下キーの真理値辞書，撃つ回数，終了要求のタプル
+        """
+        target = next(iter(game.emys), None) or next(iter(game.boss), None)
+        if target is not self.target:
+            self.target = target
+            self.offset = self.rng.randint(-self.aim_error, self.aim_error) if self.aim_error else 0
+        y = game.bird.rect.centery
+        self.goals.append(target.rect.centery+self.offset if target is not None else None)
+        goal = self.goals[0]
+        if goal is None:
+            goal = y
+        key_lst = {pg.K_UP: goal < y-10, pg.K_DOWN: goal > y+10}
+        shots = 0
+        self.wait -= 1
+        if self.wait <= 0:
+            if not (self.hold and self.rng.random() < self.hold):
+                shots = 1
+            self.wait = self.interval+self.rng.randint(-1, 1)
+        return key_lst, shots, False
+
+
+def run(game, source, frames: int, renderer=None) -> dict:
+    """
+    clock.tickで待たずにゲームを進め，1秒あたりに処理できたフレーム数を測る
+    引数1 game：進めるGame
+    引数2 source：poll(game)で入力を返すオブジェクト
+    引数3 frames：最大フレーム数
+    引数4 renderer：描画も計測する場合のRenderer（Noneなら描画しない）
+    戻り値：フレーム数，所要時間，fps，結果，スコア，（描画したときは）1フレームあたりの描画回数などの辞書
+    """
+    prof = game.prof
+    start = time.perf_counter()
+    n = 0
+    while n < frames and game.result() is None:
+        prof.start()
+        key_lst, shots, quit = source.poll(game)
+        if quit:
+            break
+        prof.lap("events")
+        game.step(key_lst, shots)
+        if renderer is not None:
+            game.draw(renderer)
+        prof.end(game.counts())
+        n += 1
+    sec = time.perf_counter()-start
+    return {
+        "frames": n,
+        "seconds": round(sec, 3),
+        "fps": round(n/sec, 1) if sec > 0 else 0.0,
+        "result": game.result(),
+        "score": game.score.score,
+        "life": game.life_gauge.life_guage,
+        "boss_life": game.boss_life.life,
+        "boss_tick": game.boss_tick,
+        "hits": game.hits,
+        "damage": game.damage,
+        "pools": {kind: pool.stats() for kind, pool in game.pools.items()},
+        "arrays": {kind: len(arr) for kind, arr in (game.arrays or {}).items()},
+        "narrowphase": game.narrow.stats() if game.narrow is not None else {},
+        "render": renderer.stats() if renderer is not None else {},
+        "profile": prof.summary(),
+    }
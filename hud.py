@@ -0,0 +1,76 @@
+import pygame as pg
+
+
+class GlyphStrip:
+    """
+    数字と符号の文字画像をフォント・色ごとに一度だけ描画して保持するクラス
+    """
+    chars = "0123456789-"
+
+    def __init__(self, font: pg.font.Font, color: tuple[int, int, int]):
+        """
+        引数1 font：描画に使うフォント
+        引数2 color：文字色
+        """
+        self.glyphs = {c: font.render(c, 0, color) for c in __class__.chars}
+        self.height = max(g.get_height() for g in self.glyphs.values())
+
+    def width(self, text: str) -> int:
+        """
+        引数 text：数字の文字列
+        戻り値：並べたときの幅
+        """
+        return sum(self.glyphs[c].get_width() for c in text)
+
+    def blit(self, dst: pg.Surface, text: str, x: int):
+        """
+        数字の文字列を文字画像の組み合わせで描画する
+        引数1 dst：描画先Surface
+        引数2 text：数字の文字列
+        引数3 x：描画を始める横座標
+        """
+        for c in text:
+            g = self.glyphs[c]
+            dst.blit(g, (x, 0))
+            x += g.get_width()
+
+
+class HudLabel:
+    """
+    「見出し: 数値」の表示を，数値が変わったときだけ作り直すクラス
+    """
+    strips = {}  # (フォントの大きさ, 色) -> GlyphStrip
+    renders = 0  # 表示を作り直した回数（全ラベルの合計）
+
+    def __init__(self, prefix: str, value: int, color: tuple[int, int, int], size: int = 50):
+        """
+        引数1 prefix：数値の前に付ける見出し
+        引数2 value：初期値
+        引数3 color：文字色
+        引数4 size：フォントの大きさ
+        """
+        key = (size, color)
+        if key not in __class__.strips:
+            __class__.strips[key] = GlyphStrip(pg.font.Font(None, size), color)
+        self.strip = __class__.strips[key]
+        self.head = pg.font.Font(None, size).render(prefix, 0, color)  # 見出しは一度だけ描画する
+        self.value = None
+        self.image = None
+        self.set(value)
+
+    def set(self, value: int):
+        """
+        表示する数値を設定し，変わっていれば表示Surfaceを作り直す
+        引数 value：表示する数値
+        """
+        if value == self.value:
+            return
+        self.value = value
+        text = str(value)
+        w = self.head.get_width()
+        self.image = pg.Surface((w+self.strip.width(text), max(self.head.get_height(), self.strip.height)), pg.SRCALPHA)
+        self.image.blit(self.head, (0, 0))
+        self.strip.blit(self.image, text, w)
+        if pg.display.get_surface() is not None:
+            self.image = self.image.convert_alpha()
+        __class__.renders += 1
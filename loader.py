@@ -0,0 +1,68 @@
+import queue
+import threading
+
+from assets import ASSETS, AssetCache
+
+
+class BackgroundLoader:
+    """
+    画像の読み込み・拡大縮小を別スレッドで行い，できたものをキューで受け取ってAssetCacheに登録するクラス
+    表示形式への変換（convert）は画面を持つメインスレッドでpoll()のときに行う
+    """
+
+    def __init__(self, cache: AssetCache = ASSETS):
+        """
+        引数 cache：読み込んだ画像を登録するAssetCache
+        """
+        self.cache = cache
+        self.done = queue.Queue()  # 別スレッドで読み込み終えた（キー，Surface）
+        self.pending = set()  # 依頼してまだ登録していないキー
+        self.threads = []
+
+    def request(self, specs: list[tuple]):
+        """
+        画像の読み込みを別スレッドで始める（登録済み・依頼済みのものは読み込まない）
+        引数 specs：AssetCache.get()に渡す引数タプルのリスト
+        """
+        keys = [self.cache.key(*spec) for spec in specs]
+        keys = [key for key in dict.fromkeys(keys) if key not in self.cache.surfaces and key not in self.pending]
+        if not keys:
+            return
+        self.pending.update(keys)
+        thread = threading.Thread(target=self._work, args=(keys,), daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def poll(self) -> int:
+        """
+        読み込み終えた画像を待たずに受け取り，変換して登録する
+        戻り値：登録した枚数
+        """
+        n = 0
+        while True:
+            try:
+                key, img = self.done.get_nowait()
+            except queue.Empty:
+                return n
+            self._store(key, img)
+            n += 1
+
+    def finish(self):
+        """
+        依頼した画像がすべて登録されるまで待つ（読み込みが間に合わなかったとき用）
+        """
+        while self.pending:
+            self._store(*self.done.get())
+
+    def _work(self, keys: list[tuple]):
+        for key in keys:
+            try:
+                img = self.cache.decode(*key)
+            except Exception:  # 失敗したものはget()のときに読み直して例外を出させる
+                img = None
+            self.done.put((key, img))
+
+    def _store(self, key: tuple, img):
+        self.pending.discard(key)
+        if img is not None:
+            self.cache.put(key, img)
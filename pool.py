@@ -0,0 +1,107 @@
+import pygame as pg
+
+
+class PooledSprite(pg.sprite.Sprite):
+    """
+    killされたらプールへ戻るスプライト
+    サブクラスはreset(*args)を定義し，__init__と同じ引数から状態を初期化し直す
+    （Poolは再利用するときに__init__の代わりにreset()を呼ぶ）
+    """
+    pool = None  # このスプライトを管理するPool
+
+    def kill(self):
+        alive = self.alive()
+        super().kill()
+        if alive and self.pool is not None:
+            self.pool.release(self)
+
+
+def check_cap(cap: int):
+    """
+    プールの上限が1以上の整数か調べる（0だと"oldest"で消す古いものがない）
+    引数 cap：プールの上限
+    """
+    if not isinstance(cap, int) or cap < 1:
+        raise ValueError(f"pool cap must be a positive integer: {cap!r}")
+
+
+class Pool:
+    """
+    PooledSpriteを上限数まで生成し，killされたものを使い回すオブジェクトプール
+    上限に達したときの方針
+    "oldest"：一番古いスプライトを消して使い回す
+    "refuse"：生成しない
+    """
+    policies = ("oldest", "refuse")
+
+    def __init__(self, cls: type, group: pg.sprite.AbstractGroup, cap: int, policy: str = "oldest"):
+        """
+        引数1 cls：生成するPooledSpriteのサブクラス
+        引数2 group：生成したスプライトを加えるグループ
+        引数3 cap：同時に存在できる最大数
+        引数4 policy：上限に達したときの方針
+        """
+        if policy not in __class__.policies:
+            raise ValueError(f"unknown pool policy: {policy}")
+        check_cap(cap)
+        self.cls = cls
+        self.group = group
+        self.cap = cap
+        self.policy = policy
+        self.free = []  # 再利用を待っているスプライト
+        self.active = {}  # 使用中のスプライト（生成順）
+        self.created = 0  # 新しく生成した数
+        self.reused = 0  # 使い回した数
+        self.dropped = 0  # 上限のため古いものを消した数
+        self.refused = 0  # 上限のため生成しなかった数
+
+    def spawn(self, *args) -> PooledSprite | None:
+        """
+        スプライトを取り出して初期化し，グループに加える
+        引数 args：clsの__init__／reset()に渡す引数
+        戻り値：スプライト（"refuse"で上限に達していればNone）
+        """
+        if len(self.active) >= self.cap:
+            if self.policy == "refuse":
+                self.refused += 1
+                return None
+            next(iter(self.active)).kill()  # 一番古いものを消してfreeに戻す
+            self.dropped += 1
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.cls(*args)
+            sprite.pool = self
+            self.created += 1
+        self.active[sprite] = None
+        self.group.add(sprite)
+        return sprite
+
+    def set_cap(self, cap: int):
+        """
+        上限を変える（使用中の数が新しい上限を超えていれば古いものから消す）
+        引数 cap：新しい上限
+        """
+        check_cap(cap)
+        self.cap = cap
+        while len(self.active) > cap:
+            next(iter(self.active)).kill()
+            self.dropped += 1
+
+    def release(self, sprite: PooledSprite):
+        """
+        killされたスプライトを再利用待ちに戻す
+        引数 sprite：戻すスプライト
+        """
+        if sprite in self.active:
+            del self.active[sprite]
+            self.free.append(sprite)
+
+    def stats(self) -> dict:
+        """
+        戻り値：使用中の数，生成数，再利用数，破棄数，拒否数の辞書
+        """
+        return {"active": len(self.active), "created": self.created, "reused": self.reused,
+                "dropped": self.dropped, "refused": self.refused}
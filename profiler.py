@@ -0,0 +1,164 @@
+import json
+import sys
+import time
+from collections import deque
+
+import pygame as pg
+
+
+WINDOW = 300  # パーセンタイルを求める直近のフレーム数
+REFRESH = 25  # オーバーレイを描き直すフレーム間隔
+
+
+class NullProfiler:
+    """
+    計測しないときに使う，何もしないプロファイラ
+    """
+    show = False
+
+    def start(self):
+        pass
+
+    def lap(self, name: str):
+        pass
+
+    def skip(self):
+        pass
+
+    def end(self, counts: dict):
+        pass
+
+    def flush(self):
+        pass
+
+    def summary(self) -> dict:
+        return {}
+
+    def close(self):
+        pass
+
+
+class FrameProfiler:
+    """
+    フレーム内の処理ごとの所要時間を測り，直近WINDOWフレームのp50/p95/p99を求めるクラス
+    start()でフレームを始め，処理の区切りごとにlap(名前)を呼び，end()で締める
+    """
+
+    def __init__(self, out: str = None, window: int = WINDOW):
+        """
+        引数1 out：1フレーム1行のJSONを書き出すパス（Noneなら書き出さない）
+        引数2 window：パーセンタイルを求める直近のフレーム数
+        """
+        self.window = window
+        self.history = {}  # 処理名 -> 直近の所要時間（ナノ秒）
+        self.phases = {}  # 今のフレームの処理名 -> 所要時間（ナノ秒）
+        self.counts = {}  # 直前のフレームのグループごとのスプライト数
+        # 直前のフレームでのメモリブロック数の増減（フレーム内で確保して解放したものは数えないので，確保した数ではない）
+        self.net_blocks = 0
+        self.idle = 0  # 今のフレームでskip()した時間（ナノ秒）
+        self.frames = 0
+        self.show = False  # オーバーレイを描画するかどうか
+        self.out = open(out, "w") if out is not None else None
+        self.image = None
+        self.t = self.t0 = time.perf_counter_ns()
+        self.blocks = sys.getallocatedblocks()
+
+    def start(self):
+        """
+        フレームの計測を始める
+        """
+        self.phases = {}
+        self.idle = 0
+        self.blocks = sys.getallocatedblocks()
+        self.t = self.t0 = time.perf_counter_ns()
+
+    def lap(self, name: str):
+        """
+        直前の区切りからの経過時間をnameの処理の時間として加える
+        引数 name：処理名
+        """
+        now = time.perf_counter_ns()
+        self.phases[name] = self.phases.get(name, 0)+now-self.t
+        self.t = now
+
+    def skip(self):
+        """
+        直前の区切りからの経過時間を待ち時間とし，どの処理にもtotalにも含めない
+        （asyncioのループで，タスクが次の出番を待っていた時間を除くのに使う）
+        """
+        now = time.perf_counter_ns()
+        self.idle += now-self.t
+        self.t = now
+
+    def end(self, counts: dict):
+        """
+        フレームの計測を終え，履歴とJSONに記録する
+        引数 counts：グループ名 -> スプライト数の辞書
+        """
+        self.phases["total"] = time.perf_counter_ns()-self.t0-self.idle
+        self.net_blocks = sys.getallocatedblocks()-self.blocks
+        self.counts = counts
+        for name, ns in self.phases.items():
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+            self.history[name].append(ns)
+        if self.out is not None:
+            self.out.write(json.dumps({
+                "frame": self.frames,
+                "ms": {name: round(ns/1e6, 4) for name, ns in self.phases.items()},
+                "counts": counts,
+                "net_blocks": self.net_blocks,
+            })+"\n")
+        self.frames += 1
+
+    def flush(self):
+        """
+        書き出し途中のJSONをファイルへ送る
+        """
+        if self.out is not None:
+            self.out.flush()
+
+    def percentiles(self, name: str) -> tuple[float, float, float]:
+        """
+        引数 name：処理名
+        戻り値：直近の所要時間のp50，p95，p99（ミリ秒）
+        """
+        hist = sorted(self.history.get(name, ()))
+        if not hist:
+            return 0.0, 0.0, 0.0
+        n = len(hist)
+        return tuple(hist[min(n-1, int(n*q))]/1e6 for q in (0.50, 0.95, 0.99))
+
+    def summary(self) -> dict:
+        """
+        戻り値：処理名 -> {"p50", "p95", "p99"}（ミリ秒）の辞書
+        """
+        return {name: dict(zip(("p50", "p95", "p99"), (round(v, 4) for v in self.percentiles(name))))
+                for name in self.history}
+
+    def overlay(self, font: pg.font.Font) -> pg.Surface:
+        """
+        処理ごとのパーセンタイルとスプライト数を並べたSurfaceを返す（REFRESHフレームごとに描き直す）
+        引数 font：描画に使うフォント
+        戻り値：オーバーレイのSurface
+        """
+        if self.image is None or self.frames%REFRESH == 0:
+            lines = [f"{'phase':<8}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for name in self.history:
+                p50, p95, p99 = self.percentiles(name)
+                lines.append(f"{name:<8}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+            lines.append(" ".join(f"{name}:{n}" for name, n in self.counts.items()))
+            lines.append(f"net blocks/frame: {self.net_blocks:+d}")
+            h = font.get_linesize()
+            self.image = pg.Surface((max(font.size(line)[0] for line in lines), h*len(lines)), pg.SRCALPHA)
+            self.image.fill((0, 0, 0, 160))
+            for i, line in enumerate(lines):
+                self.image.blit(font.render(line, True, (255, 255, 255)), (0, i*h))
+        return self.image
+
+    def close(self):
+        """
+        JSONの書き出しを終える
+        """
+        if self.out is not None:
+            self.out.close()
@@ -0,0 +1,179 @@
+import pygame as pg
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがなければ弾は通常のスプライトで扱う
+    np = None
+
+
+CHUNK = 4096  # 弾同士の当たり判定で一度に比べる弾の数
+
+
+class Hit:
+    """
+    当たった弾の範囲だけを持つオブジェクト（Explosionの生成位置に使う）
+    """
+    __slots__ = ("rect",)
+
+    def __init__(self, rect: pg.Rect):
+        self.rect = rect
+
+
+class ProjectileArray:
+    """
+    弾の位置・速度・生存フラグをNumPyの配列で持ち，全弾をまとめて動かすクラス
+    移動量は(vx, vy)*speed*dt，画面外に出た弾は1回のマスク演算で消す
+    """
+
+    def __init__(self, capacity: int, imgs: list[pg.Surface], bounds: tuple[int, int]):
+        """
+        引数1 capacity：同時に存在できる弾の数
+        引数2 imgs：弾の種類ごとの画像Surfaceのリスト
+        引数3 bounds：画面の幅と高さ
+        """
+        if np is None:
+            raise RuntimeError("ProjectileArray requires numpy")
+        self.imgs = imgs
+        self.bounds = bounds
+        self.sizes = [img.get_size() for img in imgs]
+        self.x = np.zeros(capacity, np.float32)  # 左上の座標
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)  # 進む向き
+        self.vy = np.zeros(capacity, np.float32)
+        self.speed = np.zeros(capacity, np.float32)  # 毎秒の移動量
+        self.w = np.zeros(capacity, np.float32)
+        self.h = np.zeros(capacity, np.float32)
+        self.kind = np.zeros(capacity, np.int16)  # imgsの添字
+        self.alive = np.zeros(capacity, bool)
+        self.free = list(range(capacity-1, -1, -1))  # 空いている添字（末尾から使う）
+
+    def __len__(self) -> int:
+        return len(self.alive)-len(self.free)
+
+    def spawn(self, x: float, y: float, vx: float, vy: float, speed: float, kind: int = 0) -> int | None:
+        """
+        弾を1つ追加する
+        引数1 x：左端の座標
+        引数2 y：上端の座標
+        引数3 vx：横方向の向き
+        引数4 vy：縦方向の向き
+        引数5 speed：毎秒の移動量
+        引数6 kind：画像の種類
+        戻り値：弾の添字（空きがなければNone）
+        """
+        if not self.free:
+            return None
+        i = self.free.pop()
+        self.x[i], self.y[i] = x, y
+        self.vx[i], self.vy[i], self.speed[i] = vx, vy, speed
+        self.w[i], self.h[i] = self.sizes[kind]
+        self.kind[i] = kind
+        self.alive[i] = True
+        return i
+
+    def update(self, dt: float):
+        """
+        全弾をdt秒分動かし，画面外に出た弾を消す
+        引数 dt：進める時間（秒）
+        """
+        step = self.speed*dt
+        self.x += self.vx*step
+        self.y += self.vy*step
+        out = self.alive & ((self.x < 0) | (self.x+self.w > self.bounds[0]) |
+                            (self.y < 0) | (self.y+self.h > self.bounds[1]))
+        self._kill(np.flatnonzero(out))
+
+    def collide_rect(self, rect: pg.Rect, dokill: bool) -> list[Hit]:
+        """
+        pg.sprite.spritecollideと同じく，rectと重なる弾を返す
+        引数1 rect：判定する範囲
+        引数2 dokill：Trueなら当たった弾を消す
+        戻り値：当たった弾のHitのリスト
+        """
+        idx = np.flatnonzero(self._overlap(rect))
+        hits = self._hits(idx)
+        if dokill:
+            self._kill(idx)
+        return hits
+
+    def groupcollide(self, group: pg.sprite.AbstractGroup, dokilla: bool, dokillb: bool) -> dict:
+        """
+        pg.sprite.groupcollide(group, 弾, dokilla, dokillb)と同じ結果を返す
+        引数1 group：判定するスプライトグループ
+        引数2 dokilla：Trueなら当たったスプライトをkillする
+        引数3 dokillb：Trueなら当たった弾を消す
+        戻り値：スプライトをキー，当たった弾のHitのリストを値とする辞書
+        """
+        crashed = {}
+        if not len(self):
+            return crashed
+        for sprite in group.sprites():
+            idx = np.flatnonzero(self._overlap(sprite.rect))
+            if len(idx):
+                crashed[sprite] = self._hits(idx)
+                if dokillb:
+                    self._kill(idx)
+                if dokilla:
+                    sprite.kill()
+        return crashed
+
+    def collide_array(self, other: "ProjectileArray", dokilla: bool, dokillb: bool) -> list[Hit]:
+        """
+        pg.sprite.groupcollide(自分の弾, otherの弾, dokilla, dokillb)と同じ判定を行う
+        引数1 other：相手の弾
+        引数2 dokilla：Trueなら当たった自分の弾を消す
+        引数3 dokillb：Trueなら当たった相手の弾を消す
+        戻り値：当たった自分の弾のHitのリスト
+        """
+        ia, ib = np.flatnonzero(self.alive), np.flatnonzero(other.alive)
+        if not len(ia) or not len(ib):
+            return []
+        bx0, by0 = other.x[ib], other.y[ib]
+        bx1, by1 = bx0+other.w[ib], by0+other.h[ib]
+        hits = []
+        for k in range(0, len(ia), CHUNK):  # 全組み合わせの重なりを表にまとめて求める
+            a = ia[k:k+CHUNK, None]
+            ax0, ay0 = self.x[a], self.y[a]
+            pairs = (ax0 < bx1) & (ax0+self.w[a] > bx0) & (ay0 < by1) & (ay0+self.h[a] > by0)
+            rows, cols = np.nonzero(pairs)
+            # groupcollideと同じく，先の弾が消した相手の弾には後の弾は当たらない
+            for r in np.unique(rows):
+                js = [j for j in ib[cols[rows == r]] if other.alive[j]]
+                if not js:
+                    continue
+                i = ia[k+r]
+                hits.append(Hit(self._rect(i)))
+                if dokillb:
+                    other._kill(js)
+                if dokilla:
+                    self._kill([i])
+        return hits
+
+    def blit_sequence(self, back: float = 0.0) -> list[tuple[pg.Surface, tuple[int, int]]]:
+        """
+        Surface.blitsに渡す（画像，位置）のリストを作る
+        引数 back：描画位置を何秒分戻すか（描画の補間に使う）
+        戻り値：生きている弾の（画像，位置）のリスト
+        """
+        idx = np.flatnonzero(self.alive)
+        step = self.speed[idx]*back
+        xs = (self.x[idx]-self.vx[idx]*step).astype(np.int32).tolist()
+        ys = (self.y[idx]-self.vy[idx]*step).astype(np.int32).tolist()
+        imgs = self.imgs
+        return [(imgs[k], (x, y)) for k, x, y in zip(self.kind[idx].tolist(), xs, ys)]
+
+    def _overlap(self, rect: pg.Rect):
+        return (self.alive & (self.x < rect.right) & (self.x+self.w > rect.left) &
+                (self.y < rect.bottom) & (self.y+self.h > rect.top))
+
+    def _rect(self, i: int) -> pg.Rect:
+        return pg.Rect(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+
+    def _hits(self, idx) -> list[Hit]:
+        return [Hit(self._rect(i)) for i in idx]
+
+    def _kill(self, idx):
+        idx = [i for i in idx if self.alive[i]] if isinstance(idx, list) else idx
+        if len(idx):
+            self.alive[idx] = False
+            self.free.extend(int(i) for i in idx)
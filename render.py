@@ -0,0 +1,169 @@
+import pygame as pg
+
+from background import Backdrop
+
+
+class Renderer:
+    """
+    毎フレーム背景から全体を描き直し，画面全体を転送する描画クラス
+    Surfaceと同じblit()を持つので，screenの代わりに各クラスのupdate()へ渡せる
+    blit()はすぐには描かずに今の層（layer）のキューに積み，flush()で層の小さい順に1回のblits()で描く
+    """
+
+    def __init__(self, screen: pg.Surface, background: Backdrop):
+        """
+        引数1 screen：画面Surface
+        引数2 background：背景
+        """
+        self.screen = screen
+        self.background = background
+        self.pixels = 0  # 直前のフレームで転送したピクセル数
+        self.total_pixels = 0  # これまでに転送したピクセル数の合計
+        self.frames = 0
+        self.layer = 0  # blit()で積む層
+        self.queue = {}  # 層 -> [(画像，位置)]
+        self.calls = 0  # 今のフレームでscreenに描画を頼んだ回数（背景を除く）
+        self.images = 0  # 今のフレームで描画した画像の数
+        self.total_calls = 0  # これまでの描画を頼んだ回数の合計
+        self.total_images = 0  # これまでに描画した画像の数の合計
+
+    def set_background(self, background: Backdrop):
+        """
+        背景を差し替える
+        引数 background：新しい背景
+        """
+        self.background = background
+
+    def begin(self):
+        """
+        フレームの描画を始める（背景で画面全体を塗り直す）
+        """
+        self.background.draw(self.screen)
+
+    def blit(self, img: pg.Surface, rect: pg.Rect):
+        """
+        画像を今の層のキューに積む
+        引数1 img：描画するSurface
+        引数2 rect：描画位置
+        """
+        queue = self.queue.get(self.layer)
+        if queue is None:
+            queue = self.queue[self.layer] = []
+        queue.append((img, rect))
+
+    def blits(self, seq: list[tuple[pg.Surface, tuple[int, int]]]):
+        """
+        複数の画像を今の層のキューに積む
+        引数 seq：（画像，位置）のリスト
+        """
+        queue = self.queue.get(self.layer)
+        if queue is None:
+            queue = self.queue[self.layer] = []
+        queue.extend(seq)
+
+    def draw(self, group: pg.sprite.AbstractGroup):
+        """
+        グループ内のスプライトをすべて今の層のキューに積む
+        引数 group：描画するスプライトグループ
+        """
+        self.blits([(sprite.image, sprite.rect) for sprite in group])
+
+    def flush(self):
+        """
+        キューに積んだ画像を層の小さい順（同じ層では積んだ順）に1回のblits()で描画する
+        """
+        if not self.queue:
+            return
+        queue, self.queue = self.queue, {}
+        seq = [item for layer in sorted(queue) for item in queue[layer]]
+        self._blits(seq)
+        self.calls += 1
+        self.images += len(seq)
+
+    def end(self):
+        """
+        キューに残った画像を描画してフレームの描画を終え，画面全体をディスプレイに転送する
+        """
+        self.flush()
+        pg.display.update()
+        self._count(self.screen.get_width()*self.screen.get_height())
+
+    def average_pixels(self) -> float:
+        """
+        戻り値：1フレームあたりの平均転送ピクセル数
+        """
+        return self.total_pixels/self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        """
+        戻り値：1フレームあたりの平均の描画を頼んだ回数（draw call），描画した画像の数，転送ピクセル数の辞書
+        """
+        n = self.frames or 1
+        return {"draw_calls": round(self.total_calls/n, 2), "images": round(self.total_images/n, 1),
+                "pixels": round(self.total_pixels/n)}
+
+    def _blits(self, seq: list[tuple[pg.Surface, tuple[int, int]]]):
+        self.screen.blits(seq, doreturn=False)
+
+    def _count(self, pixels: int):
+        self.pixels = pixels
+        self.total_pixels += pixels
+        self.total_calls += self.calls
+        self.total_images += self.images
+        self.calls = self.images = 0
+        self.frames += 1
+
+
+def switch(renderer: Renderer, cls: type) -> Renderer:
+    """
+    描画クラスを切り替える（転送ピクセル数・描画回数の集計は引き継ぐ）
+    引数1 renderer：今のRenderer
+    引数2 cls：切り替え先のクラス（RendererかDirtyRenderer）
+    戻り値：切り替え後のRenderer（同じクラスならrendererのまま）
+    """
+    if type(renderer) is cls:
+        return renderer
+    new = cls(renderer.screen, renderer.background)
+    new.total_pixels, new.frames = renderer.total_pixels, renderer.frames
+    new.total_calls, new.total_images = renderer.total_calls, renderer.total_images
+    return new
+
+
+class DirtyRenderer(Renderer):
+    """
+    前のフレームと今のフレームで描画した範囲だけを背景で消し，描き直して転送する描画クラス
+    背景がスクロールしている間は毎フレーム画面全体を描き直す
+    """
+
+    def __init__(self, screen: pg.Surface, background: Backdrop):
+        super().__init__(screen, background)
+        self.last_rects = []  # 前のフレームで描画した範囲
+        self.rects = []  # 今のフレームで描画した範囲
+        self.full = True  # 次のフレームで画面全体を描き直すかどうか
+
+    def set_background(self, background: Backdrop):
+        super().set_background(background)
+        self.full = True
+
+    def begin(self):
+        if self.full:
+            super().begin()
+        else:
+            for rect in self.last_rects:  # 前のフレームの描画跡を背景で消す
+                self.background.draw(self.screen, rect)
+        self.rects = []
+
+    def _blits(self, seq: list[tuple[pg.Surface, tuple[int, int]]]):
+        self.rects.extend(self.screen.blits(seq))
+
+    def end(self):
+        self.flush()
+        if self.full:
+            pg.display.update()
+            self._count(self.screen.get_width()*self.screen.get_height())
+            self.full = self.background.scrolling
+        else:
+            dirty = [r for r in self.last_rects+self.rects if r.w and r.h]
+            pg.display.update(dirty)
+            self._count(sum(r.w*r.h for r in dirty))
+        self.last_rects = self.rects
@@ -0,0 +1,184 @@
+import json
+import zlib
+
+import pygame as pg
+
+
+MAGIC = b"KKRP"  # 入力ログの先頭に置く識別子
+VERSION = 2  # 2：終了時の状態に爆発エフェクトを含めない
+UP, DOWN = 0x01, 0x02  # 1フレーム分の入力を表すビット（上位5ビットは撃った回数）
+MAX_SHOTS = 31
+
+
+def encode(key_lst, shots: int) -> int:
+    """
+    1フレーム分の入力を1バイトのビットマスクにする
+    引数1 key_lst：押下キーの真理値リスト
+    引数2 shots：撃った回数
+    戻り値：ビットマスク
+    """
+    mask = (UP if key_lst[pg.K_UP] else 0) | (DOWN if key_lst[pg.K_DOWN] else 0)
+    return mask | min(shots, MAX_SHOTS) << 3
+
+
+def decode(mask: int) -> tuple[dict, int]:
+    """
+    引数 mask：encode()したビットマスク
+    戻り値：押下キーの真理値辞書と撃った回数のタプル
+    """
+    return {pg.K_UP: bool(mask & UP), pg.K_DOWN: bool(mask & DOWN)}, mask >> 3
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = n & 0x7f
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7f) << shift
+        shift += 7
+        if not b & 0x80:
+            return n, pos
+
+
+class Recorder:
+    """
+    フレームごとの入力を「同じ入力が続いたフレーム数，ビットマスク」の組で書き出すクラス
+    入力が変わったときだけファイルに書くので，記録しながら少しずつ書き出せる
+    ファイルの形式
+    先頭：MAGIC，VERSION，乱数の種（varint），Gameの設定のJSONの長さ（varint）とJSON
+    本体：続いたフレーム数（varint，1以上），ビットマスク（1バイト）の繰り返し
+    末尾：0（varint），総フレーム数（varint），終了時の状態のCRC32（4バイト）
+    """
+
+    def __init__(self, path: str, seed: int, options: dict):
+        """
+        引数1 path：書き出すファイルのパス
+        引数2 seed：ゲームの乱数の種
+        引数3 options：再生時に同じ設定でGameを作るための設定
+        """
+        opts = json.dumps(options, sort_keys=True).encode()
+        self.file = open(path, "wb")
+        self.file.write(MAGIC+bytes([VERSION])+_varint(seed)+_varint(len(opts))+opts)
+        self.mask = None
+        self.run = 0
+        self.frames = 0
+
+    def record(self, mask: int):
+        """
+        1フレーム分の入力を記録する
+        引数 mask：encode()したビットマスク
+        """
+        if mask != self.mask:
+            self._flush()
+            self.mask = mask
+        self.run += 1
+        self.frames += 1
+
+    def close(self, digest: int):
+        """
+        残りを書き出してファイルを閉じる
+        引数 digest：終了時のゲームの状態（Game.digest()）
+        """
+        self._flush()
+        self.file.write(_varint(0)+_varint(self.frames)+digest.to_bytes(4, "big"))
+        self.file.close()
+
+    def _flush(self):
+        if self.run:
+            self.file.write(_varint(self.run)+bytes([self.mask]))
+            self.run = 0
+
+
+class Player:
+    """
+    Recorderで記録した入力ログを1フレームずつ再生するクラス
+    headless.run()やmain()の入力として使える
+    """
+
+    def __init__(self, path: str):
+        """
+        引数 path：入力ログのパス
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError(f"not an input log: {path}")
+        self.seed, pos = _read_varint(data, 5)
+        n, pos = _read_varint(data, pos)
+        self.options = json.loads(data[pos:pos+n])  # 記録時のGameの設定
+        pos += n
+        self.runs = []  # （続いたフレーム数，ビットマスク）のリスト
+        while True:
+            run, pos = _read_varint(data, pos)
+            if run == 0:
+                break
+            self.runs.append((run, data[pos]))
+            pos += 1
+        self.frames, pos = _read_varint(data, pos)  # 記録された総フレーム数
+        self.digest = int.from_bytes(data[pos:pos+4], "big")  # 記録された終了時の状態
+        self.masks = (mask for run, mask in self.runs for _ in range(run))
+
+    def poll(self, game=None) -> tuple[dict, int, bool]:
+        """
+        引数 game：再生先のGame（使わない）
+        戻り値：押下キーの真理値辞書，撃った回数，ログの終わりに達したかのタプル
+        """
+        mask = next(self.masks, None)
+        if mask is None:
+            return {pg.K_UP: False, pg.K_DOWN: False}, 0, True
+        key_lst, shots = decode(mask)
+        return key_lst, shots, False
+
+
+class Recording:
+    """
+    入力元をくるみ，poll()で返した入力をRecorderに記録するクラス
+    """
+
+    def __init__(self, source, recorder: Recorder):
+        """
+        引数1 source：poll(game)で入力を返すオブジェクト
+        引数2 recorder：記録先のRecorder
+        """
+        self.source = source
+        self.recorder = recorder
+
+    def poll(self, game) -> tuple[dict, int, bool]:
+        key_lst, shots, quit = self.source.poll(game)
+        if not quit:
+            self.recorder.record(encode(key_lst, shots))
+        return key_lst, shots, quit
+
+
+def verify(player: Player, game) -> str:
+    """
+    再生し終えたゲームが記録時と同じ状態になったかを調べる
+    引数1 player：再生に使ったPlayer
+    引数2 game：再生したGame
+    戻り値："ok"または食い違いの内容
+    """
+    if game.tmr != player.frames:
+        return f"frames differ: recorded {player.frames}, replayed {game.tmr}"
+    if game.digest() != player.digest:
+        return "state differs"
+    return "ok"
+
+
+def digest(values) -> int:
+    """
+    引数 values：状態を表す値の列
+    戻り値：CRC32
+    """
+    return zlib.crc32(repr(values).encode())
@@ -0,0 +1,201 @@
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+
+
+SCORES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scores.db")  # 既定の保存先
+TOP_N = 10  # ゲームの種類ごとにランキングに残す数
+BATCH = 64  # 1回のトランザクションでまとめて書く最大数
+WAIT = 0.5  # 最初の1件が来てから，続きをまとめるために待つ時間（秒）
+COLUMNS = ("ended_at", "variant", "seed", "result", "score", "boss_killed", "frames", "seconds",
+           "frame_p50", "frame_p95", "frame_p99")  # 1試合の記録の項目
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    variant TEXT NOT NULL,
+    seed INTEGER,
+    result TEXT,
+    score INTEGER NOT NULL,
+    boss_killed INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    frame_p50 REAL,
+    frame_p95 REAL,
+    frame_p99 REAL
+);
+CREATE TABLE IF NOT EXISTS top (
+    session_id INTEGER PRIMARY KEY REFERENCES sessions(id),
+    variant TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS top_variant_score ON top(variant, score);
+CREATE INDEX IF NOT EXISTS sessions_variant_score ON sessions(variant, score);
+"""
+
+
+class ScoreStore:
+    """
+    1試合ごとの記録をSQLite（WALモード）に追記していくクラス
+    submit()はキューに積むだけで，書き込みは別スレッドがまとめて1回のトランザクションで行う
+    sessionsは追記のみ．topには種類ごとの上位TOP_N件だけを書き込みと同じトランザクションで残すので，
+    ランキングを読む時間は記録の数によらない
+    """
+
+    def __init__(self, path: str = SCORES, top_n: int = TOP_N, batch: int = BATCH, wait: float = WAIT):
+        """
+        引数1 path：データベースファイルのパス
+        引数2 top_n：種類ごとにランキングに残す数
+        引数3 batch：1回のトランザクションでまとめて書く最大数
+        引数4 wait：続きをまとめるために待つ時間（秒）
+        """
+        self.path = path
+        self.top_n = top_n
+        self.batch = batch
+        self.wait = wait
+        self.records = queue.Queue()  # 書き込みを待っている記録（Noneで終わり）
+        self.written = 0  # 書き込んだ記録の数
+        self.commits = 0  # 書き込んだトランザクションの数
+        db = self._connect()  # 開けないときはここで例外を出させる
+        db.executescript(SCHEMA)
+        db.close()
+        self.thread = threading.Thread(target=self._work, daemon=True)
+        self.thread.start()
+
+    def submit(self, record: dict):
+        """
+        記録を書き込みのキューに積む（待たない）
+        引数 record：COLUMNSの項目を持つ辞書（ended_atを省略すると今の時刻）
+        """
+        self.records.put({"ended_at": time.time(), **record})
+
+    def close(self):
+        """
+        キューに残った記録をすべて書き込んでスレッドを終える
+        """
+        self.records.put(None)
+        self.thread.join()
+
+    def top(self, variant: str, n: int = None) -> list[dict]:
+        """
+        引数1 variant：ゲームの種類（ウィンドウのタイトル）
+        引数2 n：取り出す数（Noneならtop_n）
+        戻り値：スコアの高い順（同点なら先に記録した順）の記録のリスト
+        """
+        return top(self.path, variant, n or self.top_n, self.top_n)
+
+    def variants(self) -> list[str]:
+        """
+        戻り値：ランキングがあるゲームの種類のリスト
+        """
+        return variants(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")  # 書き込み中もランキングを読める
+        db.execute("PRAGMA synchronous=FULL")  # コミットした記録は電源が落ちても残す（コミットはまとめて行う）
+        return db
+
+    def _work(self):
+        db = self._connect()
+        done = False
+        while not done:
+            batch = []
+            record = self.records.get()
+            deadline = time.perf_counter()+self.wait
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch:
+                    break
+                try:
+                    record = self.records.get(timeout=max(0.0, deadline-time.perf_counter()))
+                except queue.Empty:
+                    break
+            done = record is None
+            if batch:
+                self._write(db, batch)
+        db.close()
+
+    def _write(self, db: sqlite3.Connection, batch: list[dict]):
+        with db:  # 1回のトランザクション（途中で落ちたら何も書かれない）
+            for record in batch:
+                cur = db.execute(f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?'*len(COLUMNS))})",
+                                 [record.get(name) for name in COLUMNS])
+                db.execute("INSERT INTO top VALUES (?, ?, ?)", (cur.lastrowid, record["variant"], record["score"]))
+                # topには種類ごとにtop_n+1件までしかないので，消すのにかかる時間も記録の数によらない
+                db.execute("DELETE FROM top WHERE variant = ? AND session_id NOT IN "
+                           "(SELECT session_id FROM top WHERE variant = ? ORDER BY score DESC, session_id LIMIT ?)",
+                           (record["variant"], record["variant"], self.top_n))
+        self.written += len(batch)
+        self.commits += 1
+
+
+def _read(path: str) -> sqlite3.Connection:
+    """
+    データベースを読み込み専用で開く（表を作らず，ファイルがなければ例外を出す）
+    引数 path：データベースファイルのパス
+    """
+    db = sqlite3.connect(f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def top(path: str, variant: str, n: int = TOP_N, top_n: int = TOP_N) -> list[dict]:
+    """
+    ランキングを読む（書き込みのスレッドは使わない）
+    n件がtopに残っている数以内ならtopから，それより多ければsessionsから（種類とスコアの索引で）取り出す
+    引数1 path：データベースファイルのパス
+    引数2 variant：ゲームの種類（ウィンドウのタイトル）
+    引数3 n：取り出す数
+    引数4 top_n：書き込むときにtopに残した数
+    戻り値：スコアの高い順（同点なら先に記録した順）の記録のリスト
+    """
+    if n <= top_n:
+        sql = ("SELECT s.* FROM top t JOIN sessions s ON s.id = t.session_id WHERE t.variant = ? "
+               "ORDER BY t.score DESC, t.session_id LIMIT ?")
+    else:
+        sql = "SELECT * FROM sessions WHERE variant = ? ORDER BY score DESC, id LIMIT ?"
+    db = _read(path)
+    rows = db.execute(sql, (variant, n)).fetchall()
+    db.close()
+    return [dict(row) for row in rows]
+
+
+def variants(path: str) -> list[str]:
+    """
+    引数 path：データベースファイルのパス
+    戻り値：ランキングがあるゲームの種類のリスト
+    """
+    db = _read(path)
+    names = [row[0] for row in db.execute("SELECT DISTINCT variant FROM top ORDER BY variant")]
+    db.close()
+    return names
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="保存した試合の記録からゲームの種類ごとのランキングを表示する")
+    parser.add_argument("--db", default=SCORES, help="データベースファイルのパス")
+    parser.add_argument("--top", type=int, default=TOP_N, help="表示する数")
+    args = parser.parse_args()
+    if args.top < 1:
+        parser.error(f"--top must be at least 1: {args.top}")
+    try:
+        names = variants(args.db)
+    except sqlite3.Error as e:
+        print(f"cannot read {args.db}: {e}", file=sys.stderr)
+        return 1
+    for variant in names:
+        print(variant)
+        for rank, rec in enumerate(top(args.db, variant, args.top), 1):
+            ended = time.strftime("%Y-%m-%d %H:%M", time.localtime(rec["ended_at"]))
+            print(f"{rank:>3} {rec['score']:>6} {rec['result'] or '-':>5} {rec['seconds']:>7.1f}s  {ended}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
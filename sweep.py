@@ -0,0 +1,179 @@
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+import engine
+import headless
+import replay
+
+
+FRAMES = 20000  # 1試合の最大フレーム数
+# 自動操作の既定（正確な操作だと敵が撃つ前に倒してしまい，敵弾に関わる値の違いが結果に出ないので下手にする）
+PILOT = {"interval": 5, "reaction": 15, "aim_error": 60, "hold": 0.3}
+_variant = None  # 各ワーカープロセスで読み込んだゲームの種類
+_defaults = {}  # 各ワーカープロセスでの，調整する値の元の値
+
+
+def _init(game: str):
+    """
+    ワーカープロセスの初期化（ゲームの種類を読み込み，画像を読み込んでおく）
+    引数 game：ゲームのモジュール名（VARIANTを持つもの）
+    """
+    global _variant
+    pg.init()
+    _variant = importlib.import_module(game).VARIANT
+    _variant.preload()
+    engine.ASSETS.preload(engine.BOSS_ASSETS)
+
+
+def _target(name: str) -> tuple[object, str]:
+    """
+    引数 name：engineの変数名（"HIT_DAMAGE"）またはクラス変数名（"EnemyBeam.speeds"）
+    戻り値：値を持つオブジェクトと属性名のタプル
+    """
+    *path, attr = name.split(".")
+    obj = engine
+    for part in path:
+        obj = getattr(obj, part)
+    if not hasattr(obj, attr):
+        raise ValueError(f"unknown parameter: {name}")
+    return obj, attr
+
+
+def simulate(params: dict, seed: int, play: str = None, frames: int = FRAMES) -> dict:
+    """
+    調整する値を設定して1試合を画面なしで行う（ワーカープロセスで呼ぶ）
+    引数1 params：値の名前 -> 値の辞書．Gameの設定名はGameに，"pilot_"で始まる名前（"pilot_interval"，
+                  "pilot_reaction"，"pilot_aim_error"，"pilot_hold"）はPILOTを上書きしてAutoPilotに渡し，
+                  それ以外はengineの変数・クラス変数に設定する
+    引数2 seed：乱数の種（playを指定したときは記録時の種を使う．Gameの設定はparamsにあればそちらを使う）
+    引数3 play：入力ログのパス（Noneなら自動操作）
+    引数4 frames：最大フレーム数
+    戻り値：headless.run()の結果
+    """
+    for name, value in _defaults.items():  # 前の試合で変えた値を戻す
+        setattr(*_target(name), value)
+    game_opts, pilot, source = {"seed": seed}, dict(PILOT), None
+    if play is not None:  # 記録時の設定を先に入れ，調整するGameの設定で上書きする
+        source = replay.Player(play)
+        game_opts.update(source.options, seed=source.seed)
+    options = inspect.signature(engine.Game).parameters
+    for name, value in params.items():
+        if name.startswith("pilot_"):
+            if name[6:] not in PILOT:
+                raise ValueError(f"unknown parameter: {name}")
+            pilot[name[6:]] = value
+        elif name in options:
+            game_opts[name] = value
+        else:
+            obj, attr = _target(name)
+            _defaults.setdefault(name, getattr(obj, attr))
+            setattr(obj, attr, value)
+    if source is None:
+        source = headless.AutoPilot(seed, **pilot)
+    return headless.run(engine.Game(_variant, **game_opts), source, frames)
+
+
+def combinations(grid: dict) -> list[dict]:
+    """
+    引数 grid：値の名前 -> 試す値のリストの辞書
+    戻り値：すべての組み合わせ（値の名前 -> 値の辞書）のリスト
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def aggregate(params: dict, reports: list[dict]) -> dict:
+    """
+    同じ組み合わせの試合結果をまとめる
+    引数1 params：組み合わせ
+    引数2 reports：simulate()の結果のリスト
+    戻り値：勝ち・負け・時間切れの数，平均の被弾数・ダメージ・スコア，ボスまでの平均フレーム数，
+            1フレームあたりの平均処理時間などの辞書
+    """
+    n = len(reports)
+    boss = [r["boss_tick"] for r in reports if r["boss_tick"] is not None]
+    frames = sum(r["frames"] for r in reports)
+    return {
+        "params": params,
+        "runs": n,
+        "clear": sum(r["result"] == "clear" for r in reports),
+        "lose": sum(r["result"] == "lose" for r in reports),
+        "timeout": sum(r["result"] is None for r in reports),
+        "score": round(sum(r["score"] for r in reports)/n, 2),
+        "hits": round(sum(r["hits"] for r in reports)/n, 2),
+        "damage": round(sum(r["damage"] for r in reports)/n, 2),
+        "life": round(sum(r["life"] for r in reports)/n, 2),
+        "boss_reached": len(boss),
+        "frames_to_boss": round(sum(boss)/len(boss), 1) if boss else None,
+        "frames": round(frames/n, 1),
+        "us_per_frame": round(sum(r["seconds"] for r in reports)/frames*1e6, 2) if frames else 0.0,
+    }
+
+
+def inert(grid: dict, results: list[dict]) -> list[str]:
+    """
+    値を変えても試合結果が変わらなかった調整する値を探す（自動操作や試合の長さが値の効く場面に届いていない）
+    引数1 grid：値の名前 -> 試す値のリストの辞書
+    引数2 results：aggregate()の結果のリスト
+    戻り値：他の値が同じ組み合わせどうしで，どの値でも結果が同じだった値の名前のリスト
+    """
+    names = []
+    for name in grid:
+        if len(grid[name]) < 2:
+            continue
+        outcomes = {}  # 他の値の組み合わせ -> 結果の集合
+        for r in results:
+            others = json.dumps({k: v for k, v in r["params"].items() if k != name}, sort_keys=True)
+            outcome = json.dumps({k: v for k, v in r.items() if k not in ("params", "us_per_frame")}, sort_keys=True)
+            outcomes.setdefault(others, set()).add(outcome)
+        if all(len(s) == 1 for s in outcomes.values()):
+            names.append(name)
+    return names
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="調整する値の組み合わせごとに，画面なしの試合を並列に行って結果をまとめる")
+    parser.add_argument("grid", help='値の名前 -> 試す値のリストのJSONファイル（例：{"HIT_DAMAGE": [25, 50]}）')
+    parser.add_argument("--game", default="kill_kokaton", help="ゲームのモジュール名（VARIANTを持つもの）")
+    parser.add_argument("--seeds", type=int, default=8, help="組み合わせごとに試す乱数の種の数")
+    parser.add_argument("--replay", default=None, help="自動操作の代わりに使う入力ログ（種はログのものを使う）")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="1試合の最大フレーム数")
+    parser.add_argument("--workers", type=int, default=None, help="プロセス数（既定はCPUの数）")
+    parser.add_argument("--out", default=None, help="まとめた結果のJSONを書き出すパス")
+    args = parser.parse_args()
+    with open(args.grid) as f:
+        grid = json.load(f)
+    combos = combinations(grid)
+    seeds = range(args.seeds) if args.replay is None else range(1)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init, initargs=(args.game,)) as pool:
+        futures = {(i, seed): pool.submit(simulate, params, seed, args.replay, args.frames)
+                   for i, params in enumerate(combos) for seed in seeds}
+        results = [aggregate(params, [futures[i, seed].result() for seed in seeds])
+                   for i, params in enumerate(combos)]
+    report = {"game": args.game, "games": len(futures), "seconds": round(time.perf_counter()-start, 2),
+              "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out is not None:
+        with open(args.out, "w") as f:
+            f.write(text+"\n")
+    print(text)
+    same = inert(grid, results)
+    if same:
+        print(f"no effect on results: {', '.join(same)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
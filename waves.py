@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import json
+import os
+
+
+WAVES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waves.json")  # 既定のウェーブ定義
+
+
+KINDS = ("enemy", "item")  # ウェーブ定義に書けるイベントの種類
+
+
+def load(path: str = WAVES, kinds=KINDS) -> dict:
+    """
+    ウェーブ定義ファイルを読み込み，イベントの値を調べる
+    形式：{"boss_score": ラスボスが出るスコア,
+           "events": [{"kind": 種類, "at": 最初のフレーム, "every": 間隔（省略可）, "count": 回数（省略可）}, ...]}
+    引数1 path：ウェーブ定義ファイル（JSON）のパス
+    引数2 kinds：書けるイベントの種類
+    戻り値：ウェーブ定義の辞書
+    """
+    with open(path) as f:
+        wave = json.load(f)
+    for event in wave["events"]:
+        if "kind" not in event or "at" not in event:
+            raise ValueError(f"wave event needs 'kind' and 'at': {event}")
+        if event["kind"] not in kinds:
+            raise ValueError(f"unknown wave event: {event['kind']}")
+        if not is_count(event["at"]):
+            raise ValueError(f"wave event 'at' must be a non-negative integer: {event}")
+        if "every" in event and not (is_count(event["every"]) and event["every"] > 0):  # 0だと同じフレームで繰り返し続ける
+            raise ValueError(f"wave event 'every' must be a positive integer: {event}")
+        if "count" in event and not is_count(event["count"]):
+            raise ValueError(f"wave event 'count' must be a non-negative integer: {event}")
+    return wave
+
+
+def is_count(value) -> bool:
+    """
+    戻り値：valueが0以上の整数か（JSONのtrue/falseは除く）
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+class WaveScheduler:
+    """
+    （フレーム，段階，順番）の順に並べたイベントを優先度付きキューで持ち，時刻になったものだけを取り出すクラス
+    1フレームの処理はキューの先頭を見るだけなので，敵の数ではなくそのフレームのイベントの数だけかかる
+    段階はstep()の中でイベントを処理する場所，順番は同じフレーム・段階のイベントの並び（敵の出現順など）
+    """
+
+    def __init__(self):
+        self.heap = []  # (フレーム，段階，順番，通し番号，種類，データ，間隔，残り回数)
+        self.seq = itertools.count()  # 同じ順番のイベントは登録順に取り出す
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def schedule(self, tick: int, phase: int, kind: str, data=None, order: int = 0,
+                 every: int = None, count: int = None):
+        """
+        イベントを登録する
+        引数1 tick：起こすフレーム
+        引数2 phase：処理する段階
+        引数3 kind：イベントの種類
+        引数4 data：イベントに添えるデータ
+        引数5 order：同じフレーム・段階での順番
+        引数6 every：繰り返す間隔（Noneなら1回だけ）
+        引数7 count：繰り返す回数（Noneなら無限）
+        """
+        if count is not None and count <= 0:
+            return
+        heapq.heappush(self.heap, (tick, phase, order, next(self.seq), kind, data, every, count))
+
+    def due(self, tick: int, phase: int):
+        """
+        tickのphaseまでに起こすイベントを順に取り出す（繰り返すイベントは次の回を登録し直す）
+        引数1 tick：今のフレーム
+        引数2 phase：今の段階
+        戻り値：（種類，データ）を返すイテレータ
+        """
+        heap = self.heap
+        while heap and heap[0][:2] <= (tick, phase):
+            t, ph, order, _, kind, data, every, count = heapq.heappop(heap)
+            if every is not None:
+                self.schedule(t+every, ph, kind, data, order, every, None if count is None else count-1)
+            yield kind, data
+
+    def cancel(self, kind: str):
+        """
+        kindのイベントをすべて取り消す
+        引数 kind：イベントの種類
+        """
+        self.heap = [event for event in self.heap if event[4] != kind]
+        heapq.heapify(self.heap)